@@ -1,26 +1,108 @@
-import requests
 import os
+import random
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils import perf
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
 
 
 class APIClient:
-    def __init__(self, token: str):
+    """
+    Session-backed API client.
+
+    One pooled keep-alive session per client. Idempotent requests are
+    retried on 429/5xx with exponential backoff and full jitter.
+    """
+
+    def __init__(self, token: str, pool_size: int | None = None,
+                 max_retries: int | None = None, timeout: float = 10):
         self.base_url = os.environ["BACKEND_BASE_URL"]
         self.headers = {
             "Authorization": f"Bearer {token}",
             "Content-Type": "application/json",
         }
-
-    def get(self, path: str):
-        return requests.get(
-            f"{self.base_url}{path}",
-            headers=self.headers,
-            timeout=10,
+        self.timeout = timeout
+        self.pool_size = pool_size or int(os.environ.get("API_POOL_SIZE", "16"))
+        self.max_retries = (
+            max_retries if max_retries is not None
+            else int(os.environ.get("API_MAX_RETRIES", "3"))
         )
+        self.backoff_base = float(os.environ.get("API_BACKOFF_SECONDS", "0.2"))
 
-    def post(self, path: str, json: dict):
-        return requests.post(
-            f"{self.base_url}{path}",
-            headers=self.headers,
-            json=json,
-            timeout=10,
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_size,
+            pool_maxsize=self.pool_size,
         )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def get(self, path: str, **kwargs):
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path: str, json: dict, **kwargs):
+        return self.request("POST", path, json=json, **kwargs)
+
+    def put(self, path: str, json: dict, **kwargs):
+        return self.request("PUT", path, json=json, **kwargs)
+
+    def patch(self, path: str, json: dict, **kwargs):
+        return self.request("PATCH", path, json=json, **kwargs)
+
+    def delete(self, path: str, **kwargs):
+        return self.request("DELETE", path, **kwargs)
+
+    def request(self, method: str, path: str, retry: bool | None = None, **kwargs):
+        """
+        `retry` defaults to True for idempotent methods only.
+        Pass retry=True to opt a POST/PATCH in when the endpoint is safe to replay.
+        """
+        method = method.upper()
+        if retry is None:
+            retry = method in IDEMPOTENT_METHODS
+        kwargs.setdefault("timeout", self.timeout)
+        perf.count("api.requests")
+
+        with perf.span("api.request", method=method, path=path):
+            return self._send(method, path, retry, **kwargs)
+
+    def _send(self, method: str, path: str, retry: bool, **kwargs):
+        attempt = 0
+        while True:
+            try:
+                response = self.session.request(
+                    method, f"{self.base_url}{path}", **kwargs
+                )
+            except (requests.ConnectionError, requests.Timeout):
+                if not retry or attempt >= self.max_retries:
+                    raise
+            else:
+                if (
+                    not retry
+                    or response.status_code not in RETRY_STATUSES
+                    or attempt >= self.max_retries
+                ):
+                    return response
+                retry_after = response.headers.get("Retry-After")
+                if retry_after and retry_after.isdigit():
+                    time.sleep(min(float(retry_after), 30))
+                    attempt += 1
+                    perf.count("api.retries")
+                    continue
+
+            time.sleep(self._backoff(attempt))
+            attempt += 1
+            perf.count("api.retries")
+
+    def _backoff(self, attempt: int) -> float:
+        # Full jitter keeps parallel workers from retrying in lockstep
+        return random.uniform(0, self.backoff_base * (2 ** attempt))
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,67 @@
+import asyncio
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from api.api_client import APIClient
+from utils import perf
+
+
+class AsyncAPIClient:
+    """
+    asyncio front-end for APIClient.
+
+    Requests run on worker threads sharing the pooled keep-alive session,
+    so the concurrency cap should not exceed the client's pool size.
+    """
+
+    def __init__(self, api_client: APIClient, concurrency: int | None = None):
+        self.api_client = api_client
+        self.concurrency = concurrency or int(
+            os.environ.get("API_CONCURRENCY", str(api_client.pool_size))
+        )
+
+    async def request(self, method: str, path: str, **kwargs):
+        return await asyncio.to_thread(self.api_client.request, method, path, **kwargs)
+
+    async def get(self, path: str, **kwargs):
+        return await self.request("GET", path, **kwargs)
+
+    async def post(self, path: str, json: dict, **kwargs):
+        return await self.request("POST", path, json=json, **kwargs)
+
+    async def put(self, path: str, json: dict, **kwargs):
+        return await self.request("PUT", path, json=json, **kwargs)
+
+    async def patch(self, path: str, json: dict, **kwargs):
+        return await self.request("PATCH", path, json=json, **kwargs)
+
+    async def delete(self, path: str, **kwargs):
+        return await self.request("DELETE", path, **kwargs)
+
+    async def batch(self, calls, return_exceptions: bool = True) -> list:
+        """
+        Run many requests concurrently, at most `concurrency` in flight.
+
+        `calls` is an iterable of (method, path) or (method, path, kwargs).
+        Results come back in input order; failures are returned as exception
+        objects unless return_exceptions=False.
+        """
+        loop = asyncio.get_running_loop()
+        send = perf.bind(self.api_client.request)
+
+        # A dedicated executor sized to the cap; the default one is capped by CPU count
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            futures = []
+            for method, path, *rest in calls:
+                kwargs = rest[0] if rest else {}
+                call = functools.partial(send, method, path, **kwargs)
+                futures.append(loop.run_in_executor(executor, call))
+
+            return await asyncio.gather(*futures, return_exceptions=return_exceptions)
+
+    def run_batch(self, calls, return_exceptions: bool = True) -> list:
+        """
+        Synchronous entry point for fixtures and seed code.
+        """
+        return asyncio.run(self.batch(calls, return_exceptions=return_exceptions))
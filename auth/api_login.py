@@ -1,13 +1,16 @@
 import os
 import requests
 
+from utils import perf
 
-def admin_api_login() -> str:
+
+@perf.timed("auth.api_login")
+def api_login(user: dict) -> str:
     response = requests.post(
         f"{os.environ['BACKEND_BASE_URL']}/auth/login",
         json={
-            "email": os.environ["ADMIN_1_EMAIL"],
-            "password": os.environ["ADMIN_1_PASSWORD"],
+            "email": user["email"],
+            "password": user["password"],
         },
         timeout=10,
     )
@@ -1,15 +1,198 @@
+import base64
+import hashlib
+import json
+import os
+import threading
+import time
+
+from utils import perf
+from utils.file_lock import file_lock, write_json_atomic
+
+
+def _cache_dir() -> str:
+    return os.environ.get("AUTH_CACHE_DIR", ".auth_cache")
+
+
+def _refresh_margin() -> int:
+    return int(os.environ.get("AUTH_REFRESH_MARGIN_SECONDS", "60"))
+
+
+def _max_age() -> float:
+    # Only for entries with no known expiry (opaque tokens, session cookies)
+    return float(os.environ.get("AUTH_CACHE_MAX_AGE", "3600"))
+
+
+def _jwt_exp(token: str) -> float | None:
+    """
+    Read the `exp` claim of a JWT without verifying it.
+    Opaque (non-JWT) tokens have no known expiry.
+    """
+    parts = token.split(".")
+    if len(parts) != 3:
+        return None
+
+    payload = parts[1] + "=" * (-len(parts[1]) % 4)
+    try:
+        claims = json.loads(base64.urlsafe_b64decode(payload))
+    except ValueError:
+        return None
+    if not isinstance(claims, dict):
+        return None
+
+    exp = claims.get("exp")
+    return float(exp) if isinstance(exp, (int, float)) else None
+
+
+def _value_exps(value: str) -> list[float]:
+    """
+    Expiries of JWTs stored in a cookie / localStorage value, either as the
+    raw token or nested in a JSON blob (e.g. a persisted auth store).
+    """
+    exp = _jwt_exp(value)
+    if exp is not None:
+        return [exp]
+    if not value.startswith(("{", "[", '"')):
+        return []
+
+    try:
+        data = json.loads(value)
+    except ValueError:
+        return []
+
+    exps = []
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+        elif isinstance(node, str):
+            exp = _jwt_exp(node)
+            if exp is not None:
+                exps.append(exp)
+    return exps
+
+
+def _storage_state_exp(storage_state: dict) -> float | None:
+    """
+    A storage_state is only as fresh as its shortest-lived credential:
+    cookie expiry, or the `exp` of any JWT kept in a cookie or in localStorage.
+    Session cookies (expires == -1) do not bound it by themselves.
+    """
+    expiries = []
+
+    for cookie in storage_state.get("cookies", []):
+        if cookie.get("expires", -1) > 0:
+            expiries.append(cookie["expires"])
+        expiries.extend(_value_exps(cookie.get("value", "")))
+
+    for origin in storage_state.get("origins", []):
+        for entry in origin.get("localStorage", []):
+            expiries.extend(_value_exps(entry.get("value", "")))
+
+    return min(expiries) if expiries else None
+
+
+def expires_at(value) -> float | None:
+    if isinstance(value, str):
+        return _jwt_exp(value)
+    if isinstance(value, dict):
+        return _storage_state_exp(value)
+    return None
+
+
 class AuthCache:
-    def __init__(self, login_func):
+    """
+    File-backed auth cache shared across threads, xdist workers and runs.
+
+    `kind` separates API tokens from UI storage_state blobs.
+    Entries are refreshed AUTH_REFRESH_MARGIN_SECONDS before they expire;
+    entries with no readable expiry are refreshed after AUTH_CACHE_MAX_AGE
+    seconds. Concurrent callers for the same user trigger exactly one login.
+    Files are written owner-only (0600).
+    """
+
+    def __init__(self, login_func, kind: str = "api"):
         self._login_func = login_func
+        self._kind = kind
         self._cache = {}
+        self._lock = threading.Lock()
+        self._user_locks = {}
 
     def exists(self, user: dict) -> bool:
-        return user["email"] in self._cache
+        return self._read(user) is not None
+
+    def get(self, user: dict):
+        value = self._read(user)
+        if value is None:
+            raise KeyError(f"No valid {self._kind} auth cached for {user['email']}")
+        return value
+
+    def get_or_login(self, user: dict):
+        value = self._read(user)
+        perf.hit(f"auth_cache.{self._kind}", value is not None)
+        if value is not None:
+            return value
+
+        with perf.span(f"auth_cache.{self._kind}.refresh"):
+            with self._user_lock(user), file_lock(self._path(user) + ".lock"):
+                # Another thread or worker may have logged in while we waited
+                value = self._read(user)
+                if value is not None:
+                    return value
+                return self._login(user)
+
+    def invalidate(self, user: dict):
+        self._cache.pop(user["email"], None)
+        try:
+            os.remove(self._path(user))
+        except FileNotFoundError:
+            pass
+
+    def _login(self, user: dict):
+        value = self._login_func(user)
+        entry = {"value": value, "expires_at": expires_at(value), "stored_at": time.time()}
+
+        os.makedirs(os.path.dirname(self._path(user)), mode=0o700, exist_ok=True)
+        write_json_atomic(self._path(user), json.dumps(entry), mode=0o600)
+        self._cache[user["email"]] = entry
+        return value
+
+    def _read(self, user: dict):
+        entry = self._cache.get(user["email"])
+        if entry is None or not self._is_fresh(entry):
+            # Another worker may already have refreshed it on disk
+            entry = self._read_file(user)
+        if entry is None or not self._is_fresh(entry):
+            return None
+
+        self._cache[user["email"]] = entry
+        return entry["value"]
+
+    def _read_file(self, user: dict) -> dict | None:
+        try:
+            with open(self._path(user)) as handle:
+                return json.load(handle)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _is_fresh(self, entry: dict) -> bool:
+        exp = entry.get("expires_at")
+        if exp is None:
+            return time.time() - entry.get("stored_at", 0) < _max_age()
+        return exp - _refresh_margin() > time.time()
 
-    def get(self, user: dict) -> str:
-        return self._cache[user["email"]]
+    def _path(self, user: dict) -> str:
+        # Tokens are only valid against the environment that issued them
+        scope = "|".join([
+            os.environ.get("BACKEND_BASE_URL", ""),
+            os.environ.get("FRONTEND_BASE_URL", ""),
+            user["email"],
+        ])
+        key = hashlib.sha256(scope.encode()).hexdigest()[:32]
+        return os.path.join(_cache_dir(), self._kind, f"{key}.json")
 
-    def login_and_store(self, user: dict) -> str:
-        token = self._login_func(user)
-        self._cache[user["email"]] = token
-        return token
+    def _user_lock(self, user: dict) -> threading.Lock:
+        with self._lock:
+            return self._user_locks.setdefault(user["email"], threading.Lock())
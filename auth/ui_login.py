@@ -1,6 +1,9 @@
 import os
 
+from utils import perf
 
+
+@perf.timed("auth.ui_login")
 def ui_login(browser, user: dict) -> dict:
     """
     Perform UI login using an existing browser and return storage_state.
@@ -0,0 +1,182 @@
+"""
+Suite-level benchmark against the local stub backend/frontend.
+
+For each worker count the suite runs twice on a fresh stub:
+- cold: empty auth / seed / asset / lease caches and an empty backend
+- warm: same stub, caches left by the cold run
+
+Each run is timed (wall clock) and split into framework phases using the
+perf report (plugins/perf_report.py). Results are compared with the stored
+baselines and the script exits 1 on a regression beyond the threshold, or
+when a scenario has no baseline yet.
+
+    python -m benchmarks.run                        # compare with baselines
+    python -m benchmarks.run --update-baseline      # record new baselines
+    python -m benchmarks.run --workers 1 4 --skip-ui
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from config.roles import ROLES
+from stub.server import start_stub
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SUITE = os.path.join(ROOT, "benchmarks", "suite")
+DEFAULT_BASELINE = os.path.join(ROOT, "benchmarks", "baselines.json")
+
+# Phase -> spans summed for it (outermost spans only, so nothing is counted twice)
+PHASES = {
+    "auth": ["auth_cache.api.refresh", "auth_cache.ui.refresh"],
+    "seed": ["seed.ensure"],
+    "context": ["browser.new_context"],
+    "page_load": ["page.navigation"],
+}
+
+
+def run_suite(workers: int, env: dict, report_dir: str, skip_ui: bool) -> dict:
+    command = [
+        sys.executable, "-m", "pytest", SUITE, "-q",
+        "-n", str(workers), "--perf-report", report_dir,
+    ]
+    if skip_ui:
+        command += ["-m", "not ui"]
+
+    start = time.perf_counter()
+    result = subprocess.run(command, env=env, cwd=ROOT, capture_output=True, text=True)
+    wall = time.perf_counter() - start
+
+    if result.returncode != 0:
+        raise RuntimeError(f"Benchmark suite failed ({workers} workers):\n{result.stdout[-4000:]}")
+
+    with open(os.path.join(report_dir, "perf-report.json")) as handle:
+        report = json.load(handle)
+
+    metrics = {"wall": wall}
+    for phase, span_names in PHASES.items():
+        metrics[phase] = sum(
+            report["spans"].get(name, {}).get("total", 0.0) for name in span_names
+        )
+    return metrics
+
+
+def benchmark_users(workers: int) -> dict:
+    """
+    One admin per worker, so UI tests never queue for a user and every
+    scenario measures the framework rather than lease contention.
+    """
+    env = {}
+    for index in range(1, workers + 1):
+        env[f"ADMIN_{index}_EMAIL"] = f"admin{index}@stub.local"
+        env[f"ADMIN_{index}_PASSWORD"] = "stub-password"
+    return env
+
+
+def run_scenarios(worker_counts: list[int], skip_ui: bool) -> dict:
+    results = {}
+
+    for workers in worker_counts:
+        stub = start_stub()
+        try:
+            with tempfile.TemporaryDirectory(prefix="bench-") as work_dir:
+                env = {
+                    **{name: value for name, value in os.environ.items()
+                       if not name.startswith(tuple(f"{role}_" for role in ROLES))},
+                    **stub.env(),
+                    **benchmark_users(workers),
+                    "AUTH_CACHE_DIR": os.path.join(work_dir, "auth"),
+                    "SEED_MANIFEST_DIR": os.path.join(work_dir, "seed"),
+                    "ASSET_CACHE_DIR": os.path.join(work_dir, "assets"),
+                    "USER_LEASE_DIR": os.path.join(work_dir, "leases"),
+                    "USER_ENV_FILE": os.path.join(work_dir, "none.env"),
+                }
+                env.pop("SEED_RUN_NAMESPACE", None)
+
+                for phase in ("cold", "warm"):
+                    report_dir = os.path.join(work_dir, f"report-{phase}")
+                    results[f"{workers}w-{phase}"] = run_suite(workers, env, report_dir, skip_ui)
+        finally:
+            stub.stop()
+
+    return results
+
+
+def compare(results: dict, baselines: dict, threshold: float, min_delta: float) -> list[str]:
+    """
+    Problems that fail the run: regressions, and results with no baseline
+    to compare against (a comparison that cannot fail is not a gate).
+    """
+    regressions = []
+
+    for scenario, metrics in results.items():
+        if scenario not in baselines:
+            regressions.append(f"{scenario}: no baseline (record one with --update-baseline)")
+            continue
+
+        for metric, value in metrics.items():
+            baseline = baselines[scenario].get(metric)
+            if baseline is None:
+                regressions.append(
+                    f"{scenario} {metric}: no baseline (record one with --update-baseline)"
+                )
+                continue
+            if value > baseline * (1 + threshold) and value - baseline > min_delta:
+                regressions.append(
+                    f"{scenario} {metric}: {value:.3f}s vs baseline {baseline:.3f}s "
+                    f"(+{(value / baseline - 1) if baseline else float('inf'):.0%})"
+                )
+    return regressions
+
+
+def print_results(results: dict, baselines: dict):
+    metrics = ["wall", *PHASES]
+    print(f"{'scenario':<12}" + "".join(f"{m:>14}" for m in metrics))
+    for scenario, values in results.items():
+        cells = []
+        for metric in metrics:
+            baseline = baselines.get(scenario, {}).get(metric)
+            suffix = f" ({baseline:.2f})" if baseline is not None else ""
+            cells.append(f"{values[metric]:.2f}{suffix}".rjust(14))
+        print(f"{scenario:<12}" + "".join(cells))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--skip-ui", action="store_true", help="API / seed phases only")
+    parser.add_argument("--threshold", type=float,
+                        default=float(os.environ.get("BENCH_THRESHOLD", "0.25")))
+    parser.add_argument("--min-delta", type=float,
+                        default=float(os.environ.get("BENCH_MIN_DELTA", "0.05")),
+                        help="ignore regressions smaller than this many seconds")
+    args = parser.parse_args(argv)
+
+    baselines = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as handle:
+            baselines = json.load(handle)
+
+    results = run_scenarios(args.workers, args.skip_ui)
+    print_results(results, baselines)
+
+    if args.update_baseline:
+        baselines.update(results)
+        with open(args.baseline, "w") as handle:
+            json.dump(baselines, handle, indent=2, sort_keys=True)
+        print(f"Baselines written to {args.baseline}")
+        return 0
+
+    problems = compare(results, baselines, args.threshold, args.min_delta)
+    for line in problems:
+        print(f"FAIL {line}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,2 @@
+# The benchmark suite runs on the real framework fixtures
+from tests.conftest import *  # noqa: F401,F403
@@ -0,0 +1,20 @@
+import os
+
+import pytest
+
+BENCH_TESTS = int(os.environ.get("BENCH_TESTS", "32"))
+
+
+@pytest.mark.parametrize("case", range(BENCH_TESTS))
+def test_items_api(api_client, case):
+    response = api_client.get("/items?page=1&limit=10")
+    response.raise_for_status()
+    assert response.json()["pagination"]["total"] >= 31
+
+
+@pytest.mark.ui
+@pytest.mark.parametrize("case", range(BENCH_TESTS))
+def test_items_page(page, case):
+    frontend_url = os.environ["FRONTEND_BASE_URL"]
+    page.goto(f"{frontend_url}/items", wait_until="domcontentloaded")
+    page.wait_for_selector("[data-testid='items-table']", timeout=10000)
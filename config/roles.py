@@ -0,0 +1,14 @@
+ROLES = ("ADMIN", "EDITOR", "VIEWER")
+DEFAULT_ROLE = "ADMIN"
+
+ROLE_MARKERS = {"admin": "ADMIN", "editor": "EDITOR", "viewer": "VIEWER"}
+
+
+def role_of(node) -> str:
+    """
+    Role a test declares through its admin/editor/viewer marker.
+    """
+    for marker, role in ROLE_MARKERS.items():
+        if node.get_closest_marker(marker):
+            return role
+    return DEFAULT_ROLE
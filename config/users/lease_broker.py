@@ -0,0 +1,230 @@
+import hashlib
+import json
+import os
+import random
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+
+from utils.file_lock import file_lock, write_json_atomic
+
+# Waiters that stop polling for this long are dropped from the queue
+TICKET_STALE_SECONDS = 10
+# A waiter refreshes its ticket at most this often, so idle polls write nothing
+TICKET_REFRESH_SECONDS = TICKET_STALE_SECONDS / 4
+# Expired / dead leases are reclaimed at most this often, and only when needed
+RECLAIM_INTERVAL_SECONDS = 1.0
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class _LeaseState:
+    """
+    In-memory view of one role's state file.
+
+    - free:   free emails, most recently released first (popleft / appendleft),
+              so a process that releases and re-acquires keeps its user, its
+              cached login and its warm browser context
+    - leases: email -> owner token + pid + expiry
+    - queue:  FIFO of waiting tickets; only the head may take a free user
+    """
+
+    def __init__(self, data: dict):
+        self.free = deque(data.get("free", []))
+        self.leases = data.get("leases", {})
+        self.queue = deque(data.get("queue", []))
+        self.members = data.get("members")
+        self.reclaimed_at = data.get("reclaimed_at", 0.0)
+        self.dirty = False
+
+    def dump(self) -> str:
+        return json.dumps({
+            "free": list(self.free),
+            "leases": self.leases,
+            "queue": list(self.queue),
+            "members": self.members,
+            "reclaimed_at": self.reclaimed_at,
+        })
+
+
+class LeaseBroker:
+    """
+    Cross-process user lease store backed by one lock-protected JSON file per role.
+
+    acquire returns (email, token); release / renew only act when the token
+    still owns the lease, so a holder whose lease expired and was handed to
+    someone else cannot free or extend the new holder's lease.
+
+    Leases expire after USER_LEASE_TTL seconds, or as soon as the owning
+    process is gone, so users held by crashed workers return to the pool.
+
+    Acquire and release are O(1) on the lease state: the free list and queue
+    are deques, reclaim only runs (throttled) when an acquire is blocked, and
+    a poll that changes nothing neither rewrites nor, if nobody else wrote,
+    re-reads the file.
+    """
+
+    def __init__(self, lease_dir: str | None = None, ttl: float | None = None):
+        self.lease_dir = lease_dir or os.environ.get("USER_LEASE_DIR", ".user_leases")
+        self.ttl = ttl or float(os.environ.get("USER_LEASE_TTL", "600"))
+        self.poll_interval = float(os.environ.get("USER_LEASE_POLL_SECONDS", "0.05"))
+        self._cached = {}  # role -> (file signature, _LeaseState)
+        self._digests = {}  # role -> (emails object, members digest)
+
+    def acquire(self, role: str, emails: list[str], timeout: float) -> tuple[str, str]:
+        ticket = uuid.uuid4().hex
+        deadline = time.monotonic() + timeout
+
+        while True:
+            with self._locked_state(role, emails) as state:
+                lease = self._try_acquire(state, ticket)
+            if lease:
+                return lease
+
+            if time.monotonic() >= deadline:
+                with self._locked_state(role, emails) as state:
+                    state.queue = deque(t for t in state.queue if t["id"] != ticket)
+                    state.dirty = True
+                raise RuntimeError(
+                    f"No available users for role {role} after waiting {timeout:g}s"
+                )
+
+            time.sleep(self.poll_interval * random.uniform(1, 2))
+
+    def release(self, role: str, email: str, token: str, emails: list[str]):
+        with self._locked_state(role, emails) as state:
+            if self._owns(state, email, token):
+                del state.leases[email]
+                state.free.appendleft(email)
+                state.dirty = True
+
+    def renew(self, role: str, email: str, token: str, emails: list[str]):
+        with self._locked_state(role, emails) as state:
+            if self._owns(state, email, token):
+                state.leases[email]["expires_at"] = time.time() + self.ttl
+                state.dirty = True
+
+    @staticmethod
+    def _owns(state: _LeaseState, email: str, token: str) -> bool:
+        lease = state.leases.get(email)
+        return lease is not None and lease.get("token") == token
+
+    def _try_acquire(self, state: _LeaseState, ticket: str) -> tuple[str, str] | None:
+        now = time.time()
+        queue = state.queue
+
+        waiter = next((w for w in queue if w["id"] == ticket), None)
+        if waiter is None:
+            queue.append({"id": ticket, "pid": os.getpid(), "seen_at": now})
+            state.dirty = True
+        elif now - waiter["seen_at"] >= TICKET_REFRESH_SECONDS:
+            waiter["seen_at"] = now
+            state.dirty = True
+
+        # Only scan leases / waiters when something blocks us: no free user,
+        # or a waiter ahead of us that may have died
+        blocked = not state.free or queue[0]["id"] != ticket
+        if blocked and now - state.reclaimed_at >= RECLAIM_INTERVAL_SECONDS:
+            self._reclaim(state, now)
+
+        if queue[0]["id"] != ticket or not state.free:
+            return None
+
+        queue.popleft()
+        email = state.free.popleft()
+        token = f"{ticket}:{os.getpid()}"
+        state.leases[email] = {"token": token, "pid": os.getpid(), "expires_at": now + self.ttl}
+        state.dirty = True
+        return email, token
+
+    def _reclaim(self, state: _LeaseState, now: float):
+        for email, lease in list(state.leases.items()):
+            if lease["expires_at"] < now or not _pid_alive(lease["pid"]):
+                del state.leases[email]
+                state.free.append(email)
+
+        state.queue = deque(
+            waiter for waiter in state.queue
+            if now - waiter["seen_at"] < TICKET_STALE_SECONDS and _pid_alive(waiter["pid"])
+        )
+        state.reclaimed_at = now
+        state.dirty = True
+
+    def _sync_members(self, state: _LeaseState, role: str, emails: list[str]):
+        # The configured pool may have changed since the state was written
+        digest = self._members_digest(role, emails)
+        if state.members == digest:
+            return
+
+        members = set(emails)
+        state.leases = {e: l for e, l in state.leases.items() if e in members}
+        state.free = deque(e for e in emails if e not in state.leases)
+        state.members = digest
+        state.dirty = True
+
+    def _members_digest(self, role: str, emails: list[str]) -> str:
+        cached = self._digests.get(role)
+        if cached and cached[0] is emails:
+            return cached[1]
+        digest = hashlib.sha256("\n".join(emails).encode()).hexdigest()
+        self._digests[role] = (emails, digest)
+        return digest
+
+    @contextmanager
+    def _locked_state(self, role: str, emails: list[str]):
+        """
+        Lock, load (or reuse the cached copy if the file is unchanged),
+        yield the state, save if it changed, unlock.
+        """
+        path = self._path(role)
+
+        with file_lock(path + ".lock"):
+            signature = _signature(path)
+            cached = self._cached.get(role)
+            if cached and signature is not None and cached[0] == signature:
+                state = cached[1]
+            else:
+                state = _LeaseState(_load(path))
+
+            self._sync_members(state, role, emails)
+            try:
+                yield state
+            except BaseException:
+                # Possibly half-updated: never save it, reload next time
+                self._cached.pop(role, None)
+                raise
+
+            if state.dirty:
+                state.dirty = False
+                write_json_atomic(path, state.dump())
+                signature = _signature(path)
+            self._cached[role] = (signature, state)
+
+    def _path(self, role: str) -> str:
+        return os.path.join(self.lease_dir, f"{role.lower()}.json")
+
+
+def _load(path: str) -> dict:
+    try:
+        with open(path) as handle:
+            return json.load(handle)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def _signature(path: str) -> tuple | None:
+    # A write always replaces the file (temp + rename), so this changes with it
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
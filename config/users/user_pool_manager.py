@@ -1,34 +1,72 @@
-import threading
-from config.users.user_pools import ADMIN_USERS, EDITOR_USERS, VIEWER_USERS
+import os
+
+from config.users.lease_broker import LeaseBroker
+from config.users.user_pools import UserRecord, get_pool, worker_position
+from utils import perf
 
 
 class UserPoolManager:
     """
-    Thread-safe role-based user leasing.
+    Role-based user leasing, shared by all threads and xdist workers.
+
+    acquire blocks (FIFO) for up to USER_LEASE_TIMEOUT seconds when every
+    user of the role is leased, then fails.
+
+    With USER_POOL_SHARDING=true each xdist worker leases only from its own
+    deterministic slice of every pool, so workers never contend.
     """
 
-    def __init__(self):
-        self._lock = threading.Lock()
-        self._leased = set()
-
-        self._pools = {
-            "ADMIN": ADMIN_USERS,
-            "EDITOR": EDITOR_USERS,
-            "VIEWER": VIEWER_USERS,
-        }
-
-    def acquire(self, role: str) -> dict:
-        with self._lock:
-            for user in self._pools[role]:
-                user_key = f"{role}:{user['email']}"
-                if user_key not in self._leased:
-                    self._leased.add(user_key)
-                    user["id"] = user["email"]  # stable identifier
-                    return user
-
-            raise RuntimeError(f"No available users for role {role}")
-
-    def release(self, user: dict):
-        with self._lock:
-            user_key = f"{user['role']}:{user['email']}"
-            self._leased.discard(user_key)
+    def __init__(self, broker: LeaseBroker | None = None):
+        self._sharded = os.environ.get("USER_POOL_SHARDING", "false").lower() == "true"
+        self._broker = broker or self._default_broker()
+        self._timeout = float(os.environ.get("USER_LEASE_TIMEOUT", "120"))
+        self._by_email = {}
+        self._emails_by_role = {}
+        self._tokens = {}  # email -> lease token of the lease this manager holds
+
+    def acquire(self, role: str, timeout: float | None = None) -> UserRecord:
+        with perf.span("user_pool.wait", role=role):
+            email, token = self._broker.acquire(
+                role,
+                self._emails(role),
+                timeout=self._timeout if timeout is None else timeout,
+            )
+        self._tokens[email] = token
+        return self._users(role)[email]
+
+    def release(self, user: UserRecord):
+        token = self._tokens.pop(user["email"], None)
+        if token:
+            self._broker.release(user["role"], user["email"], token, self._emails(user["role"]))
+
+    def renew(self, user: UserRecord):
+        """
+        Extend the lease of a user held longer than USER_LEASE_TTL.
+        """
+        token = self._tokens.get(user["email"])
+        if token:
+            self._broker.renew(user["role"], user["email"], token, self._emails(user["role"]))
+
+    def _users(self, role: str) -> dict[str, UserRecord]:
+        users = self._by_email.get(role)
+        if users is None:
+            pool = get_pool(role)
+            records = pool.worker_shard() if self._sharded else pool.users
+            users = self._by_email[role] = {user.email: user for user in records}
+        return users
+
+    def _emails(self, role: str) -> list[str]:
+        # Same list object every call, so the broker can cache its digest
+        emails = self._emails_by_role.get(role)
+        if emails is None:
+            emails = self._emails_by_role[role] = list(self._users(role))
+        return emails
+
+    def _default_broker(self) -> LeaseBroker:
+        if not self._sharded:
+            return LeaseBroker()
+
+        # Disjoint slices: a private lease file per worker is enough
+        index, _ = worker_position()
+        lease_dir = os.environ.get("USER_LEASE_DIR", ".user_leases")
+        return LeaseBroker(lease_dir=os.path.join(lease_dir, f"shard-{index}"))
@@ -1,35 +1,169 @@
+import json
 import os
+import threading
+from functools import lru_cache
 
+from dotenv import dotenv_values
 
-def _load_users(role: str) -> list[dict]:
+from config.roles import ROLES
+
+
+class UserRecord:
+    """
+    Immutable-by-convention user credentials, compact enough for pools of
+    thousands. Supports user["email"] style access for dict-based callers.
+    """
+
+    __slots__ = ("email", "password", "role")
+
+    def __init__(self, email: str, password: str, role: str):
+        self.email = email
+        self.password = password
+        self.role = role
+
+    @property
+    def id(self) -> str:
+        return self.email  # stable identifier
+
+    def __getitem__(self, key: str):
+        if key not in ("email", "password", "role", "id"):
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __repr__(self) -> str:
+        return f"UserRecord(email={self.email!r}, role={self.role!r})"
+
+
+class RolePool:
     """
-    Load users for a role from ENV.
-    Pattern: ROLE_1_EMAIL / ROLE_1_PASSWORD
+    Users of one role, loaded on first access.
+
+    Sources, merged in this order (duplicates by email are dropped):
+    - ENV: ROLE_1_EMAIL / ROLE_1_PASSWORD, ROLE_2_...
+    - USER_ENV_FILE (default .env), same pattern; ENV wins
+    - USER_CREDENTIALS_FILE: JSON or YAML {"ROLE": [{"email", "password"}, ...]}
     """
-    users = []
+
+    def __init__(self, role: str):
+        self.role = role
+        self._users = None
+        self._lock = threading.Lock()
+
+    @property
+    def users(self) -> tuple[UserRecord, ...]:
+        users = self._load()
+        if not users:
+            raise RuntimeError(f"No users found for role {self.role}")
+        return users
+
+    def size(self) -> int:
+        return len(self._load())
+
+    def shard(self, index: int, count: int) -> tuple[UserRecord, ...]:
+        """
+        Deterministic slice owned by worker `index` of `count`.
+        """
+        shard = self.users[index::count]
+        if not shard:
+            raise RuntimeError(
+                f"No users for role {self.role} in shard {index}/{count} "
+                f"({len(self.users)} users for {count} workers)"
+            )
+        return shard
+
+    def worker_shard(self) -> tuple[UserRecord, ...]:
+        """
+        Slice for the current xdist worker (the whole pool outside xdist).
+        """
+        index, count = worker_position()
+        return self.shard(index, count)
+
+    def __len__(self) -> int:
+        return len(self.users)
+
+    def __iter__(self):
+        return iter(self.users)
+
+    def __getitem__(self, index):
+        return self.users[index]
+
+    def _load(self) -> tuple[UserRecord, ...]:
+        if self._users is None:
+            with self._lock:
+                if self._users is None:
+                    self._users = _load_users(self.role)
+        return self._users
+
+
+def _load_users(role: str) -> tuple[UserRecord, ...]:
+    env = {**_env_file(os.environ.get("USER_ENV_FILE", ".env")), **os.environ}
+    users = {}
     index = 1
 
     while True:
-        email = os.environ.get(f"{role}_{index}_EMAIL")
-        password = os.environ.get(f"{role}_{index}_PASSWORD")
+        email = env.get(f"{role}_{index}_EMAIL")
+        password = env.get(f"{role}_{index}_PASSWORD")
 
         if not email or not password:
             break
 
-        users.append({
-            "email": email,
-            "password": password,
-            "role": role
-        })
-
+        users.setdefault(email, UserRecord(email, password, role))
         index += 1
 
-    if not users:
-        raise RuntimeError(f"No users found for role {role}")
+    credentials_file = os.environ.get("USER_CREDENTIALS_FILE")
+    if credentials_file:
+        for entry in _credentials_file(credentials_file).get(role, []):
+            users.setdefault(entry["email"], UserRecord(entry["email"], entry["password"], role))
+
+    return tuple(users.values())
+
+
+@lru_cache(maxsize=None)
+def _env_file(path: str) -> dict:
+    if not os.path.exists(path):
+        return {}
+    return {key: value for key, value in dotenv_values(path).items() if value is not None}
+
+
+@lru_cache(maxsize=None)
+def _credentials_file(path: str) -> dict:
+    with open(path) as handle:
+        if path.endswith((".yaml", ".yml")):
+            import yaml  # optional, only needed for YAML credentials
+            return yaml.safe_load(handle) or {}
+        return json.load(handle)
 
-    return users
+
+def worker_position() -> tuple[int, int]:
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "")
+    if not worker.startswith("gw"):
+        return 0, 1
+    return int(worker[2:]), int(os.environ.get("PYTEST_XDIST_WORKER_COUNT", "1"))
+
+
+_POOLS = {role: RolePool(role) for role in ROLES}
+
+
+def get_pool(role: str) -> RolePool:
+    return _POOLS[role]
+
+
+def pool_size(role: str) -> int:
+    """
+    Number of configured users for a role (0 if none, no error).
+    """
+    return get_pool(role).size()
 
 
-ADMIN_USERS = _load_users("ADMIN")
-EDITOR_USERS = _load_users("EDITOR")
-VIEWER_USERS = _load_users("VIEWER")
+def __getattr__(name: str) -> RolePool:
+    # ADMIN_USERS / EDITOR_USERS / VIEWER_USERS, resolved lazily
+    role = name.removesuffix("_USERS")
+    if name.endswith("_USERS") and role in _POOLS:
+        return _POOLS[role]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,11 @@
+from seed.namespace import run_namespace
+
+pytest_plugins = [
+    "plugins.perf_report",
+    "plugins.role_scheduler",
+]
+
+
+def pytest_configure(config):
+    # Exported before xdist spawns workers, so they all share one run namespace
+    run_namespace()
@@ -0,0 +1,187 @@
+"""
+Framework overhead report.
+
+With `--perf-report=DIR` (or PERF_REPORT_DIR), spans and counters are
+recorded through utils.perf (nothing is kept otherwise), dumped per process
+and merged by the controller into:
+
+- a terminal summary: p50/p95/p99 per span, cache hit ratios, request counts,
+  slowest tests by framework overhead
+- DIR/perf-report.json (machine readable)
+- DIR/trace.json (Chrome trace, open in chrome://tracing or Perfetto)
+"""
+import glob
+import json
+import os
+
+import pytest
+
+from utils import perf
+
+SLOWEST_TESTS = 10
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--perf-report",
+        default=os.environ.get("PERF_REPORT_DIR"),
+        metavar="DIR",
+        help="write framework timing report, JSON and Chrome trace to DIR",
+    )
+
+
+def pytest_configure(config):
+    report_dir = config.getoption("perf_report")
+    if not report_dir:
+        return
+
+    perf.enable()
+    if hasattr(config, "workerinput"):
+        return
+
+    # Controller / single process: start from a clean slate before workers spawn
+    os.makedirs(report_dir, exist_ok=True)
+    for path in glob.glob(os.path.join(report_dir, "raw-*.json")):
+        os.remove(path)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item):
+    perf.set_current_test(item.nodeid)
+    yield
+    perf.set_current_test(None)
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_sessionfinish(session):
+    config = session.config
+    report_dir = config.getoption("perf_report")
+    if not report_dir:
+        return
+
+    worker = getattr(config, "workerinput", {}).get("workerid", "main")
+    with open(os.path.join(report_dir, f"raw-{worker}-{os.getpid()}.json"), "w") as handle:
+        json.dump(perf.drain(), handle)
+
+    if hasattr(config, "workerinput"):
+        return
+
+    spans, counters = _merge(report_dir)
+    report = build_report(spans, counters)
+    config._perf_report = report
+
+    with open(os.path.join(report_dir, "perf-report.json"), "w") as handle:
+        json.dump(report, handle, indent=2)
+    with open(os.path.join(report_dir, "trace.json"), "w") as handle:
+        json.dump(chrome_trace(spans), handle)
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    report = getattr(config, "_perf_report", None)
+    if not report:
+        return
+
+    write = terminalreporter.write_line
+    terminalreporter.section("framework overhead")
+
+    write(f"{'span':<32}{'count':>8}{'total s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, stats in report["spans"].items():
+        write(
+            f"{name:<32}{stats['count']:>8}{stats['total']:>10.2f}"
+            f"{stats['p50'] * 1000:>10.1f}{stats['p95'] * 1000:>10.1f}{stats['p99'] * 1000:>10.1f}"
+        )
+
+    if report["caches"]:
+        write("")
+        for cache, stats in report["caches"].items():
+            write(f"{cache:<32}hit ratio {stats['hit_ratio']:.0%} ({stats['hit']}/{stats['hit'] + stats['miss']})")
+
+    if report["counters"]:
+        write("")
+        for name, value in report["counters"].items():
+            write(f"{name:<32}{value:>8}")
+
+    if report["slowest_tests"]:
+        write("")
+        write("slowest tests by framework overhead:")
+        for entry in report["slowest_tests"]:
+            write(f"  {entry['overhead']:>8.2f}s  {entry['test']}")
+
+
+def build_report(spans: list[dict], counters: dict) -> dict:
+    by_name = {}
+    for entry in spans:
+        by_name.setdefault(entry["name"], []).append(entry["duration"])
+
+    span_stats = {}
+    for name, durations in sorted(by_name.items(), key=lambda kv: -sum(kv[1])):
+        durations.sort()
+        span_stats[name] = {
+            "count": len(durations),
+            "total": sum(durations),
+            "p50": _percentile(durations, 50),
+            "p95": _percentile(durations, 95),
+            "p99": _percentile(durations, 99),
+            "max": durations[-1],
+        }
+
+    caches = {}
+    other_counters = {}
+    for name, value in sorted(counters.items()):
+        cache, _, outcome = name.rpartition(".")
+        if outcome in ("hit", "miss"):
+            caches.setdefault(cache, {"hit": 0, "miss": 0})[outcome] = value
+        else:
+            other_counters[name] = value
+    for stats in caches.values():
+        lookups = stats["hit"] + stats["miss"]
+        stats["hit_ratio"] = stats["hit"] / lookups if lookups else 0.0
+
+    # Only top-level spans, so nested ones (login inside a cache miss) count once
+    overhead = {}
+    for entry in spans:
+        if entry["test"] and entry["depth"] == 0:
+            overhead[entry["test"]] = overhead.get(entry["test"], 0.0) + entry["duration"]
+    slowest = sorted(overhead.items(), key=lambda kv: -kv[1])[:SLOWEST_TESTS]
+
+    return {
+        "spans": span_stats,
+        "caches": caches,
+        "counters": other_counters,
+        "slowest_tests": [{"test": test, "overhead": value} for test, value in slowest],
+    }
+
+
+def chrome_trace(spans: list[dict]) -> dict:
+    events = []
+    for entry in spans:
+        args = dict(entry.get("attrs", {}))
+        if entry["test"]:
+            args["test"] = entry["test"]
+        events.append({
+            "name": entry["name"],
+            "ph": "X",
+            "ts": entry["start"] * 1_000_000,
+            "dur": entry["duration"] * 1_000_000,
+            "pid": entry["pid"],
+            "tid": entry["tid"],
+            "args": args,
+        })
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def _merge(report_dir: str) -> tuple[list[dict], dict]:
+    spans, counters = [], {}
+    for path in sorted(glob.glob(os.path.join(report_dir, "raw-*.json"))):
+        with open(path) as handle:
+            data = json.load(handle)
+        spans.extend(data["spans"])
+        for name, value in data["counters"].items():
+            counters[name] = counters.get(name, 0) + value
+    return spans, counters
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    # Nearest-rank percentile
+    index = max(0, -(-len(sorted_values) * pct // 100) - 1)
+    return sorted_values[int(index)]
@@ -0,0 +1,211 @@
+"""
+Role / dataset affinity scheduling for pytest-xdist.
+
+Enable with `-n <workers> --role-affinity`.
+
+- Workers group collected tests by (role, seed dataset) and split each group
+  into at most `pool_size(role)` shards, balanced on recorded durations
+- The controller hands shards out so a worker keeps getting the same
+  (role, dataset) while any is left, heaviest shards first
+- No more than `pool_size(role)` workers run a role at the same time
+"""
+import heapq
+import json
+import os
+from collections import Counter
+
+import pytest
+from xdist.scheduler import LoadScopeScheduling
+
+from config.roles import role_of
+from utils.file_lock import write_json_atomic
+
+DURATIONS_KEY = "role_affinity/durations"
+DEFAULT_DATASET = "flow3"
+SCOPE_SEPARATOR = "|"
+
+# nodeid -> seconds (setup + call + teardown) recorded by this process
+_durations = {}
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--role-affinity",
+        action="store_true",
+        default=False,
+        help="xdist: schedule tests by (role, seed dataset) affinity",
+    )
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_configure(config):
+    # trylast: the cacheprovider sets config.cache in its own pytest_configure
+    if config.getoption("role_affinity") and getattr(config, "cache", None) is None:
+        raise pytest.UsageError(
+            "--role-affinity needs the cache provider (it stores test durations "
+            "and the affinity map); drop -p no:cacheprovider"
+        )
+
+
+def dataset_of(node) -> str:
+    marker = node.get_closest_marker("seed")
+    return marker.args[0] if marker else DEFAULT_DATASET
+
+
+def build_affinity(items, durations: dict, pool_size) -> dict:
+    """
+    Map each test to a scope "<role>|<dataset>|<shard>".
+
+    Shards are filled longest-test-first onto the least loaded shard.
+    Tests without history weigh as much as the average known test.
+    """
+    default_weight = (sum(durations.values()) / len(durations)) if durations else 1.0
+
+    groups = {}
+    for item in items:
+        groups.setdefault((role_of(item), dataset_of(item)), []).append(item.nodeid)
+
+    scopes, weights, caps = {}, {}, {}
+
+    for (role, dataset), nodeids in groups.items():
+        caps[role] = max(1, pool_size(role))
+        shard_count = min(caps[role], len(nodeids))
+        shards = [(0.0, shard) for shard in range(shard_count)]
+
+        for nodeid in sorted(nodeids, key=lambda n: -durations.get(n, default_weight)):
+            load, shard = heapq.heappop(shards)
+            scope = SCOPE_SEPARATOR.join([role, dataset, str(shard)])
+            weight = durations.get(nodeid, default_weight)
+
+            scopes[nodeid] = scope
+            weights[scope] = weights.get(scope, 0.0) + weight
+            heapq.heappush(shards, (load + weight, shard))
+
+    return {"scopes": scopes, "weights": weights, "caps": caps}
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    config = node.config
+    if config.getoption("role_affinity"):
+        node.workerinput["role_affinity_path"] = _affinity_path(config)
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_collection_modifyitems(config, items):
+    path = getattr(config, "workerinput", {}).get("role_affinity_path")
+    if not path:
+        return
+
+    from config.users.user_pools import pool_size
+
+    durations = config.cache.get(DURATIONS_KEY, {})
+    # Every worker collects the same items, so they all write the same map
+    write_json_atomic(path, json.dumps(build_affinity(items, durations, pool_size)))
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_make_scheduler(config, log):
+    if not config.getoption("role_affinity"):
+        return None
+    return RoleAffinityScheduling(config, log, _affinity_path(config))
+
+
+def pytest_runtest_logreport(report):
+    # On the controller this also sees every report coming back from workers
+    _durations[report.nodeid] = _durations.get(report.nodeid, 0.0) + report.duration
+
+
+def pytest_sessionfinish(session):
+    config = session.config
+    if hasattr(config, "workerinput") or getattr(config, "cache", None) is None:
+        return
+
+    if _durations:
+        durations = config.cache.get(DURATIONS_KEY, {})
+        durations.update(_durations)
+        config.cache.set(DURATIONS_KEY, durations)
+
+
+def _affinity_path(config) -> str:
+    directory = config.cache.mkdir("role_affinity")
+    return os.path.join(str(directory), f"affinity-{os.getpid()}.json")
+
+
+class RoleAffinityScheduling(LoadScopeScheduling):
+    def __init__(self, config, log, affinity_path: str):
+        super().__init__(config, log)
+        self._affinity_path = affinity_path
+        self._affinity = None
+        self._last_group = {}
+
+    def _load_affinity(self) -> dict:
+        if self._affinity is None:
+            with open(self._affinity_path) as handle:
+                self._affinity = json.load(handle)
+        return self._affinity
+
+    def _split_scope(self, nodeid: str) -> str:
+        scope = self._load_affinity()["scopes"].get(nodeid)
+        return scope or super()._split_scope(nodeid)
+
+    def _assign_work_unit(self, node):
+        scope = self._pick_scope(node)
+        if scope is None:
+            # Every remaining shard belongs to a role at its concurrency cap
+            return
+
+        work_unit = self.workqueue.pop(scope)
+        self.assigned_work.setdefault(node, {})[scope] = work_unit
+        self._last_group[node] = _group(scope)
+
+        worker_collection = self.registered_collections[node]
+        node.send_runtest_some([
+            worker_collection.index(nodeid)
+            for nodeid, completed in work_unit.items()
+            if not completed
+        ])
+
+    def _pick_scope(self, node) -> str | None:
+        affinity = self._load_affinity()
+        busy = self._busy_roles(exclude=node)
+
+        candidates = [
+            scope for scope in self.workqueue
+            if (role := _role(scope)) is None
+            or busy[role] < affinity["caps"].get(role, 1)
+        ]
+        if not candidates:
+            return None
+
+        hot = [s for s in candidates if _group(s) == self._last_group.get(node)]
+        return max(hot or candidates, key=lambda s: affinity["weights"].get(s, 0.0))
+
+    def _busy_roles(self, exclude) -> Counter:
+        busy = Counter()
+        for node, workload in self.assigned_work.items():
+            if node is exclude:
+                continue
+            roles = {
+                _role(scope) for scope, unit in workload.items()
+                if not all(unit.values())
+            }
+            busy.update(role for role in roles if role)
+        return busy
+
+    def mark_test_complete(self, node, item_index, duration=0):
+        super().mark_test_complete(node, item_index, duration)
+
+        # A finished shard may free a role slot for a worker left idle by the cap
+        for other in list(self.assigned_work):
+            if other is not node and not self._pending_of(self.assigned_work[other]):
+                self._reschedule(other)
+
+
+def _role(scope: str) -> str | None:
+    parts = scope.split(SCOPE_SEPARATOR)
+    return parts[0] if len(parts) == 3 else None
+
+
+def _group(scope: str) -> tuple:
+    return tuple(scope.split(SCOPE_SEPARATOR)[:2])
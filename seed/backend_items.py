@@ -0,0 +1,25 @@
+from typing import Iterator
+
+from api.api_client import APIClient
+
+PAGE_SIZE = 100
+
+
+def iter_items(api_client: APIClient, page_size: int = PAGE_SIZE) -> Iterator[dict]:
+    """
+    Page through /items, yielding every item the client can see.
+    """
+    page = 1
+
+    while True:
+        response = api_client.get(f"/items?page={page}&limit={page_size}")
+        response.raise_for_status()
+        body = response.json()
+        items = body.get("data", body.get("items", []))
+
+        yield from items
+
+        total = body.get("pagination", {}).get("total", 0)
+        if len(items) < page_size or page * page_size >= total:
+            return
+        page += 1
@@ -0,0 +1,42 @@
+import os
+import time
+import uuid
+
+from config.users.user_pools import worker_position
+from utils.seed_builders import NAMESPACE_TAG_PREFIX, namespace_tag  # noqa: F401
+
+RUN_NAMESPACE_ENV = "SEED_RUN_NAMESPACE"
+
+
+def run_namespace() -> str:
+    """
+    Namespace shared by every worker of one test run: run-<epoch>-<id>.
+
+    Created once and exported through ENV, so xdist workers spawned after
+    the controller called this inherit the same value. The epoch lets the
+    orphan sweeper age namespaces left behind by crashed runs.
+    """
+    namespace = os.environ.get(RUN_NAMESPACE_ENV)
+    if not namespace:
+        namespace = f"run-{int(time.time())}-{uuid.uuid4().hex[:8]}"
+        os.environ[RUN_NAMESPACE_ENV] = namespace
+    return namespace
+
+
+def worker_namespace() -> str:
+    index, _ = worker_position()
+    return f"{run_namespace()}-w{index}"
+
+
+def namespace_of(item: dict) -> str | None:
+    for tag in item.get("tags") or []:
+        if tag.startswith(NAMESPACE_TAG_PREFIX):
+            return tag[len(NAMESPACE_TAG_PREFIX):]
+    return None
+
+
+def namespace_created_at(namespace: str) -> int | None:
+    parts = namespace.split("-")
+    if len(parts) < 3 or parts[0] != "run" or not parts[1].isdigit():
+        return None
+    return int(parts[1])
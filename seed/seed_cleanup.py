@@ -0,0 +1,97 @@
+import os
+import time
+
+from api.api_client import APIClient
+from api.async_api_client import AsyncAPIClient
+from seed.backend_items import iter_items
+from seed.namespace import namespace_created_at, namespace_of
+from utils import perf
+
+
+class SeedCleaner:
+    """
+    Delete namespaced seed data through the API, many requests at a time.
+
+    Namespace cleanup never touches items without a namespace tag (e.g. the
+    shared Flow 3 baseline); delete_items deletes whatever ids it is given.
+
+    Tests may create namespaced items the seed layer never saw, so namespace
+    cleanup also scans /items for leftovers. Suites that register every item
+    they create (SeedManager.track) can turn that off with
+    SEED_CLEANUP_SCAN=false.
+    """
+
+    def __init__(self, api_client: APIClient, concurrency: int | None = None,
+                 scan_leftovers: bool | None = None):
+        self.api_client = api_client
+        self.async_client = AsyncAPIClient(api_client, concurrency=concurrency)
+        self.scan_leftovers = (
+            scan_leftovers if scan_leftovers is not None
+            else os.environ.get("SEED_CLEANUP_SCAN", "true").lower() == "true"
+        )
+
+    def delete_namespace(self, namespace: str, item_ids: list | None = None) -> int:
+        """
+        Delete a namespace's items: the ids recorded at creation first, then
+        anything left over found by a scan (always done when ids are unknown).
+        """
+        with perf.span("seed.cleanup", namespace=namespace):
+            deleted = self.delete_items(item_ids or [])
+            if item_ids is not None and not self.scan_leftovers:
+                return deleted
+
+            known = set(item_ids or [])
+            leftovers = [
+                item_id for item_id in self._item_ids_by_namespace().get(namespace, [])
+                if item_id not in known
+            ]
+            return deleted + self.delete_items(leftovers)
+
+    def sweep_orphans(self, max_age: float | None = None, current_run: str | None = None) -> int:
+        """
+        Delete run namespaces older than SEED_ORPHAN_TTL seconds (default 6h),
+        left behind by runs that crashed before their own cleanup.
+        Namespaces of `current_run` (and its workers) are always kept.
+        """
+        max_age = max_age or float(os.environ.get("SEED_ORPHAN_TTL", str(6 * 3600)))
+        cutoff = time.time() - max_age
+
+        with perf.span("seed.sweep"):
+            item_ids = []
+            for namespace, ids in self._item_ids_by_namespace().items():
+                created_at = namespace_created_at(namespace)
+                if current_run and (namespace == current_run or namespace.startswith(f"{current_run}-")):
+                    continue
+                if created_at is not None and created_at < cutoff:
+                    item_ids.extend(ids)
+
+            return self.delete_items(item_ids)
+
+    def _item_ids_by_namespace(self) -> dict[str, list]:
+        # Collect ids first: deleting while paging would shift the pages
+        by_namespace = {}
+        for item in iter_items(self.api_client):
+            namespace = namespace_of(item)
+            if namespace:
+                by_namespace.setdefault(namespace, []).append(item.get("id") or item.get("_id"))
+        return by_namespace
+
+    def delete_items(self, item_ids: list) -> int:
+        if not item_ids:
+            return 0
+
+        responses = self.async_client.run_batch(
+            ("DELETE", f"/items/{item_id}") for item_id in item_ids
+        )
+
+        failures = [
+            response for response in responses
+            if isinstance(response, Exception)
+            or (not response.ok and response.status_code != 404)
+        ]
+        if failures:
+            raise RuntimeError(
+                f"Cleanup failed for {len(failures)} of {len(item_ids)} item(s); "
+                f"first error: {failures[0]!r}"
+            )
+        return len(item_ids)
@@ -0,0 +1,151 @@
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+from typing import Iterable
+
+from api.api_client import APIClient
+from utils import perf
+
+
+class SeedReport:
+    def __init__(self):
+        self.created = 0
+        self.created_ids = []  # ids the backend returned for created items
+        self.failed = []  # (payload, error) pairs still failing after retries
+
+    @property
+    def all_ids_known(self) -> bool:
+        """
+        False if some created item came back without an id, so callers must
+        look the data up on the backend instead of trusting created_ids.
+        """
+        return len(self.created_ids) == self.created
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed
+
+    def raise_for_failures(self):
+        if self.failed:
+            _, first_error = self.failed[0]
+            raise RuntimeError(
+                f"Seed failed for {len(self.failed)} item(s); first error: {first_error}"
+            )
+
+
+class SeedEngine:
+    """
+    Push builder output to the backend through a concurrent worker pool.
+
+    - Payloads are consumed lazily, so generators of any size work
+    - Only a bounded window of requests is in flight at any time
+    - Uses SEED_BULK_PATH (chunks of SEED_BULK_SIZE) when the backend has one
+    - Failed items are retried one by one, up to SEED_MAX_RETRIES rounds
+    """
+
+    def __init__(self, api_client: APIClient, path: str = "/items",
+                 workers: int | None = None, bulk_path: str | None = None,
+                 bulk_size: int | None = None, max_retries: int | None = None):
+        self.api_client = api_client
+        self.path = path
+        self.workers = workers or int(os.environ.get("SEED_WORKERS", "8"))
+        self.bulk_path = bulk_path or os.environ.get("SEED_BULK_PATH")
+        self.bulk_size = bulk_size or int(os.environ.get("SEED_BULK_SIZE", "100"))
+        self.max_retries = (
+            max_retries if max_retries is not None
+            else int(os.environ.get("SEED_MAX_RETRIES", "2"))
+        )
+
+    def run(self, payloads: Iterable[dict]) -> SeedReport:
+        report = SeedReport()
+
+        if self.bulk_path:
+            failed = self._push(self._chunks(payloads), self._create_bulk, report)
+        else:
+            failed = self._push(((payload,) for payload in payloads),
+                                self._create_one, report)
+
+        for _ in range(self.max_retries):
+            if not failed:
+                break
+            # Retries go item by item so one bad payload cannot sink a whole chunk
+            failed = self._push(((payload,) for payload, _ in failed),
+                                self._create_one, report)
+
+        report.failed = failed
+        return report
+
+    def _push(self, units: Iterable[tuple], create, report: SeedReport) -> list:
+        failed = []
+
+        def collect(done):
+            for future in done:
+                ids, errors = future.result()
+                report.created += len(ids)
+                report.created_ids.extend(item_id for item_id in ids if item_id is not None)
+                failed.extend(errors)
+
+        create = perf.bind(create)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            in_flight = set()
+            for unit in units:
+                in_flight.add(executor.submit(create, unit))
+                if len(in_flight) >= self.workers * 2:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    collect(done)
+            collect(wait(in_flight).done)
+
+        return failed
+
+    # Create calls return (ids of created items, (payload, error) pairs);
+    # an id is None when the backend response does not carry one.
+
+    def _create_one(self, unit: tuple) -> tuple[list, list]:
+        payload, = unit
+        try:
+            response = self.api_client.post(self.path, json=payload)
+        except Exception as error:
+            return [], [(payload, repr(error))]
+
+        if not response.ok:
+            return [], [(payload, f"{response.status_code}: {response.text[:200]}")]
+        return _created_ids(response, 1), []
+
+    def _create_bulk(self, chunk: tuple) -> tuple[list, list]:
+        try:
+            response = self.api_client.post(self.bulk_path, json=list(chunk))
+        except Exception as error:
+            return [], [(payload, repr(error)) for payload in chunk]
+
+        if not response.ok:
+            error = f"{response.status_code}: {response.text[:200]}"
+            return [], [(payload, error) for payload in chunk]
+        return _created_ids(response, len(chunk)), []
+
+    def _chunks(self, payloads: Iterable[dict]):
+        iterator = iter(payloads)
+        while chunk := tuple(islice(iterator, self.bulk_size)):
+            yield chunk
+
+
+def _created_ids(response, expected: int) -> list:
+    """
+    Ids from a create response: the item (or list of items), optionally
+    wrapped in {"data": ...}. Padded with None when they cannot be read.
+    """
+    try:
+        body = response.json()
+    except ValueError:
+        body = None
+    if isinstance(body, dict) and "data" in body:
+        body = body["data"]
+
+    items = body if isinstance(body, list) else [body]
+    ids = [
+        (item.get("id") or item.get("_id")) if isinstance(item, dict) else None
+        for item in items
+    ]
+    if len(ids) != expected:
+        return [None] * expected
+    return ids
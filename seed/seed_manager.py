@@ -1,10 +1,67 @@
+import os
+
 from seed.admin_seed import AdminSeed
+from seed.seed_engine import SeedEngine
+from utils import perf
+from utils.seed_builders import iter_flow3_items
 
 
 class SeedManager:
+    """
+    Per-worker seed entry point.
+
+    Each role is verified at most once per session; after that
+    ensure_seed is an in-memory lookup with no network traffic.
+    """
+
     def __init__(self, api_client):
         self.admin_seed = AdminSeed(api_client)
+        self.engine = SeedEngine(api_client)
+        self._verified = set()
+        self._namespace_ids = {}  # namespace -> created item ids, None if unknown
 
     def ensure_seed(self, role: str):
-        if role == "ADMIN":
-            self.admin_seed.ensure()
+        perf.hit("seed_manager", role in self._verified)
+        if role in self._verified:
+            return
+
+        with perf.span("seed.ensure", role=role):
+            if role == "ADMIN":
+                self.admin_seed.ensure()
+
+        self._verified.add(role)
+
+    def seed_isolated(self, namespace: str, count: int | None = None):
+        """
+        Create a private Flow 3 dataset tagged with `namespace`.
+        Deleted again by SeedCleaner.delete_namespace at session end.
+
+        Items are keyed as their own dataset ("flow3@<namespace>"), so they
+        never stand in for the shared baseline.
+        """
+        count = count or int(os.environ.get("ISOLATED_SEED_COUNT", "31"))
+        with perf.span("seed.isolated", namespace=namespace):
+            report = self.engine.run(iter_flow3_items(
+                count=count,
+                seed=self.admin_seed.rng_seed,
+                namespace=namespace,
+            ))
+        self.track(namespace, report.created_ids if report.all_ids_known else None)
+        report.raise_for_failures()
+
+    def track(self, namespace: str, item_ids: list | None):
+        """
+        Record items created in `namespace` (by seed_isolated or by tests),
+        so cleanup can delete them by id. None means some ids are unknown.
+        """
+        known = self._namespace_ids.get(namespace, [])
+        self._namespace_ids[namespace] = (
+            known + list(item_ids)
+            if known is not None and item_ids is not None else None
+        )
+
+    def namespace_item_ids(self, namespace: str) -> list | None:
+        """
+        Ids of everything tracked in `namespace`, or None if some are unknown.
+        """
+        return self._namespace_ids.get(namespace, [])
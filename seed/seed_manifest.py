@@ -0,0 +1,65 @@
+import hashlib
+import json
+import os
+import time
+from typing import Iterable
+
+from utils.file_lock import file_lock, write_json_atomic
+from utils.seed_builders import seed_key
+
+# Bump when the shape of the seeded dataset changes
+DATASET_VERSION = 1
+
+
+def dataset_fingerprint(role: str, payloads: Iterable[dict]) -> tuple[str, set[str]]:
+    """
+    Content-addressed fingerprint of a role's dataset.
+    Returns (fingerprint, seed keys) so callers can diff against the backend.
+
+    Payloads must come from a seeded builder for this to be stable.
+    """
+    digest = hashlib.sha256(f"{DATASET_VERSION}:{role}".encode())
+    keys = set()
+
+    for payload in payloads:
+        digest.update(json.dumps(payload, sort_keys=True).encode())
+        key = seed_key(payload)
+        if key:
+            keys.add(key)
+
+    return digest.hexdigest(), keys
+
+
+class SeedManifest:
+    """
+    Local record of which dataset fingerprint each role was last seeded with.
+
+    One file per (backend, role) under SEED_MANIFEST_DIR, shared by all
+    workers. The lock doubles as the reseed lock so only one worker reseeds.
+    """
+
+    def __init__(self, role: str):
+        backend = os.environ.get("BACKEND_BASE_URL", "")
+        backend_key = hashlib.sha256(backend.encode()).hexdigest()[:16]
+        directory = os.path.join(
+            os.environ.get("SEED_MANIFEST_DIR", ".seed_manifest"), backend_key
+        )
+        self.path = os.path.join(directory, f"{role.lower()}.json")
+
+    def lock(self):
+        return file_lock(self.path + ".lock")
+
+    def fingerprint(self) -> str | None:
+        try:
+            with open(self.path) as handle:
+                return json.load(handle).get("fingerprint")
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def record(self, fingerprint: str, item_count: int):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        write_json_atomic(self.path, json.dumps({
+            "fingerprint": fingerprint,
+            "item_count": item_count,
+            "seeded_at": time.time(),
+        }))
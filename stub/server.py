@@ -0,0 +1,341 @@
+"""
+Local stand-in for the real backend and frontend.
+
+Backend:  POST /auth/login, GET/POST /items, POST /items/bulk,
+          GET/PUT/PATCH/DELETE /items/<id>
+Frontend: /login, /items (data-testid='items-table'), /static/*
+
+Run standalone with `python -m stub.server`, or start in-process with
+start_stub() (used by the benchmark harness).
+"""
+import base64
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+TOKEN_TTL_SECONDS = 3600
+
+
+def _fake_jwt(email: str) -> str:
+    """
+    Unsigned JWT-shaped token; only the `exp` claim matters to the framework.
+    """
+    def encode(payload: dict) -> str:
+        return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+    claims = {"sub": email, "exp": int(time.time()) + TOKEN_TTL_SECONDS}
+    return f"{encode({'alg': 'none', 'typ': 'JWT'})}.{encode(claims)}.stub"
+
+
+class ItemStore:
+    def __init__(self):
+        self._items = {}
+        self._lock = threading.Lock()
+
+    def create(self, payload: dict) -> dict:
+        item = {**payload, "_id": uuid.uuid4().hex}
+        item["id"] = item["_id"]
+        with self._lock:
+            self._items[item["_id"]] = item
+        return item
+
+    def get(self, item_id: str) -> dict | None:
+        return self._items.get(item_id)
+
+    def update(self, item_id: str, payload: dict, replace: bool) -> dict | None:
+        with self._lock:
+            item = self._items.get(item_id)
+            if item is None:
+                return None
+            updated = {**({} if replace else item), **payload, "_id": item_id, "id": item_id}
+            self._items[item_id] = updated
+            return updated
+
+    def delete(self, item_id: str) -> bool:
+        with self._lock:
+            return self._items.pop(item_id, None) is not None
+
+    def page(self, page: int, limit: int, search: str | None) -> dict:
+        with self._lock:
+            items = list(self._items.values())
+        if search:
+            needle = search.lower()
+            items = [item for item in items if needle in item.get("name", "").lower()]
+
+        start = (page - 1) * limit
+        return {
+            "data": items[start:start + limit],
+            "pagination": {"page": page, "limit": limit, "total": len(items)},
+        }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; Nagle + delayed ACK would add ~40ms each
+    disable_nagle_algorithm = True
+    latency = 0.0
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status: int, body: bytes = b"", content_type: str = "application/json",
+              headers: dict | None = None):
+        if self.latency:
+            time.sleep(self.latency)
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("Access-Control-Allow-Headers", "Authorization, Content-Type")
+        self.send_header("Access-Control-Allow-Methods", "GET, POST, PUT, PATCH, DELETE, OPTIONS")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _json(self, status: int, payload):
+        self._send(status, json.dumps(payload).encode())
+
+    def _body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"null")
+
+    def do_OPTIONS(self):
+        self._send(204)
+
+
+class _BackendHandler(_Handler):
+    store: ItemStore = None
+
+    def _authorized(self) -> bool:
+        if self.headers.get("Authorization", "").startswith("Bearer "):
+            return True
+        self._json(401, {"error": "unauthorized"})
+        return False
+
+    def do_POST(self):
+        path = urlparse(self.path).path
+        if path == "/auth/login":
+            body = self._body() or {}
+            if not body.get("email") or not body.get("password"):
+                self._json(401, {"error": "invalid credentials"})
+                return
+            self._json(200, {"token": _fake_jwt(body["email"])})
+            return
+
+        if not self._authorized():
+            return
+        if path == "/items":
+            self._json(201, self.store.create(self._body()))
+        elif path == "/items/bulk":
+            self._json(201, [self.store.create(payload) for payload in self._body()])
+        else:
+            self._json(404, {"error": "not found"})
+
+    def do_GET(self):
+        if not self._authorized():
+            return
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+
+        if url.path == "/items":
+            self._json(200, self.store.page(
+                page=int(query.get("page", ["1"])[0]),
+                limit=int(query.get("limit", ["10"])[0]),
+                search=query.get("search", [None])[0],
+            ))
+            return
+
+        item = self._item(url.path)
+        if item:
+            self._json(200, item)
+        else:
+            self._json(404, {"error": "not found"})
+
+    def do_PUT(self):
+        self._update(replace=True)
+
+    def do_PATCH(self):
+        self._update(replace=False)
+
+    def do_DELETE(self):
+        if not self._authorized():
+            return
+        item_id = self._item_id(urlparse(self.path).path)
+        if item_id and self.store.delete(item_id):
+            self._send(204)
+        else:
+            self._json(404, {"error": "not found"})
+
+    def _update(self, replace: bool):
+        if not self._authorized():
+            return
+        item_id = self._item_id(urlparse(self.path).path)
+        item = self.store.update(item_id, self._body(), replace) if item_id else None
+        if item:
+            self._json(200, item)
+        else:
+            self._json(404, {"error": "not found"})
+
+    def _item(self, path: str) -> dict | None:
+        item_id = self._item_id(path)
+        return self.store.get(item_id) if item_id else None
+
+    @staticmethod
+    def _item_id(path: str) -> str | None:
+        match = re.fullmatch(r"/items/([^/]+)", path)
+        return match.group(1) if match else None
+
+
+LOGIN_PAGE = """<!doctype html>
+<html><head><title>Login</title><link rel="stylesheet" href="/static/app.css"></head>
+<body>
+<form id="login">
+  <input type="email" name="email">
+  <input type="password" name="password">
+  <button type="submit">Sign in</button>
+</form>
+<script src="/static/app.js"></script>
+<script>bindLogin("__BACKEND__");</script>
+</body></html>
+"""
+
+ITEMS_PAGE = """<!doctype html>
+<html><head><title>Items</title><link rel="stylesheet" href="/static/app.css"></head>
+<body>
+<table data-testid="items-table"><thead><tr><th>Name</th><th>Type</th><th>Price</th></tr></thead>
+<tbody></tbody></table>
+<script src="/static/app.js"></script>
+<script>loadItems("__BACKEND__");</script>
+</body></html>
+"""
+
+STATIC_FILES = {
+    "/static/app.css": (
+        "text/css",
+        "body{font-family:sans-serif}table{border-collapse:collapse}td,th{padding:4px}",
+    ),
+    "/static/app.js": (
+        "application/javascript",
+        """
+function bindLogin(backend) {
+  document.getElementById("login").addEventListener("submit", async (event) => {
+    event.preventDefault();
+    const form = event.target;
+    const response = await fetch(backend + "/auth/login", {
+      method: "POST",
+      headers: {"Content-Type": "application/json"},
+      body: JSON.stringify({email: form.email.value, password: form.password.value}),
+    });
+    if (!response.ok) return;
+    const {token} = await response.json();
+    localStorage.setItem("token", token);
+    document.cookie = "session=" + token + "; path=/";
+    window.location.href = "/items";
+  });
+}
+
+async function loadItems(backend) {
+  const token = localStorage.getItem("token") || "";
+  const response = await fetch(backend + "/items?page=1&limit=10", {
+    headers: {Authorization: "Bearer " + token},
+  });
+  if (!response.ok) return;
+  const {data} = await response.json();
+  const rows = data.map((item) =>
+    "<tr><td>" + item.name + "</td><td>" + item.item_type + "</td><td>" + item.price + "</td></tr>");
+  document.querySelector("[data-testid='items-table'] tbody").innerHTML = rows.join("");
+}
+""",
+    ),
+}
+
+
+class _FrontendHandler(_Handler):
+    backend_url = ""
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+
+        if path in ("/", "/login"):
+            self._html(LOGIN_PAGE)
+        elif path == "/items":
+            self._html(ITEMS_PAGE)
+        elif path in STATIC_FILES:
+            self._static(*STATIC_FILES[path])
+        else:
+            self._send(404, b"not found", "text/plain")
+
+    def _html(self, template: str):
+        self._send(200, template.replace("__BACKEND__", self.backend_url).encode(), "text/html")
+
+    def _static(self, content_type: str, content: str):
+        body = content.encode()
+        etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+        if self.headers.get("If-None-Match") == etag:
+            self._send(304, headers={"ETag": etag})
+            return
+        self._send(200, body, content_type, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+
+class StubServers:
+    """
+    Running backend + frontend pair; `stop()` shuts both down.
+    """
+
+    def __init__(self, backend: ThreadingHTTPServer, frontend: ThreadingHTTPServer):
+        self._servers = (backend, frontend)
+        self.backend_url = f"http://127.0.0.1:{backend.server_port}"
+        self.frontend_url = f"http://127.0.0.1:{frontend.server_port}"
+
+    def env(self) -> dict:
+        return {"BACKEND_BASE_URL": self.backend_url, "FRONTEND_BASE_URL": self.frontend_url}
+
+    def stop(self):
+        for server in self._servers:
+            server.shutdown()
+            server.server_close()
+
+
+def start_stub(backend_port: int = 0, frontend_port: int = 0,
+               latency_ms: float | None = None) -> StubServers:
+    """
+    Start both servers on background threads. Port 0 picks a free port.
+    STUB_LATENCY_MS adds a fixed delay per response to mimic a remote service.
+    """
+    latency = (latency_ms if latency_ms is not None
+               else float(os.environ.get("STUB_LATENCY_MS", "0"))) / 1000
+
+    backend_handler = type("BackendHandler", (_BackendHandler,), {
+        "store": ItemStore(), "latency": latency,
+    })
+    backend = ThreadingHTTPServer(("127.0.0.1", backend_port), backend_handler)
+
+    frontend_handler = type("FrontendHandler", (_FrontendHandler,), {
+        "backend_url": f"http://127.0.0.1:{backend.server_port}", "latency": latency,
+    })
+    frontend = ThreadingHTTPServer(("127.0.0.1", frontend_port), frontend_handler)
+
+    for server in (backend, frontend):
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    return StubServers(backend, frontend)
+
+
+if __name__ == "__main__":
+    servers = start_stub(
+        backend_port=int(os.environ.get("STUB_BACKEND_PORT", "8000")),
+        frontend_port=int(os.environ.get("STUB_FRONTEND_PORT", "3000")),
+    )
+    for name, value in servers.env().items():
+        print(f"{name}={value}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        servers.stop()
@@ -1,30 +1,39 @@
 import pytest
 import os
 from auth.auth_cache import AuthCache
-from auth.api_login import admin_api_login
+from config.roles import role_of
+from config.users.user_pool_manager import UserPoolManager
+from config.users.user_pools import get_pool, worker_position
+from auth.api_login import api_login
+from auth.ui_login import ui_login
 from api.api_client import APIClient
+from seed.namespace import run_namespace, worker_namespace
+from seed.seed_cleanup import SeedCleaner
 from seed.seed_manager import SeedManager
+from ui.context_pool import ContextPool
+from ui.network import AssetCache, block_requests, replay_backend_from_har
+from utils import perf
 
 
 @pytest.fixture(scope="session")
 def admin_user():
-    return {
-        "email": os.environ["ADMIN_1_EMAIL"],
-        "password": os.environ["ADMIN_1_PASSWORD"],
-        "role": "ADMIN",
-    }
+    # Global seed is always created by the first admin account
+    return get_pool("ADMIN")[0]
 
 
 @pytest.fixture(scope="session")
 def auth_cache():
-    return AuthCache(login_func=lambda _: admin_api_login())
+    return AuthCache(login_func=api_login, kind="api")
+
+
+@pytest.fixture(scope="session")
+def ui_auth_cache(browser):
+    return AuthCache(login_func=lambda user: ui_login(browser, user), kind="ui")
 
 
 @pytest.fixture(scope="session")
 def auth_state(admin_user, auth_cache):
-    if not auth_cache.exists(admin_user):
-        auth_cache.login_and_store(admin_user)
-    return auth_cache.get(admin_user)
+    return auth_cache.get_or_login(admin_user)
 
 
 @pytest.fixture(scope="session")
@@ -42,8 +51,116 @@ def seed_guard(seed_manager):
     seed_manager.ensure_seed(role="ADMIN")
 
 
+@pytest.fixture(scope="session")
+def seed_namespace(api_client, seed_manager):
+    """
+    This worker's private namespace, deleted at session end.
+
+    Tests that create items in it tag them with namespace_tag(namespace) and
+    should register their ids with seed_manager.track(namespace, ids);
+    untracked items are still found by the cleanup scan (SEED_CLEANUP_SCAN).
+    """
+    cleaner = SeedCleaner(api_client)
+    if worker_position()[0] == 0:
+        cleaner.sweep_orphans(current_run=run_namespace())
+
+    namespace = worker_namespace()
+    yield namespace
+    cleaner.delete_namespace(namespace, seed_manager.namespace_item_ids(namespace))
+
+
+@pytest.fixture(scope="session")
+def isolated_items(seed_manager, seed_namespace):
+    """
+    Per-worker Flow 3 dataset for tests that write, so they can run in parallel.
+    """
+    seed_manager.seed_isolated(seed_namespace)
+    return seed_namespace
+
+
+@pytest.fixture(scope="session")
+def context_pool(request, browser, ui_auth_cache, user_pool_manager):
+    """
+    One context kept idle per role this worker's UI tests use (or
+    CONTEXT_POOL_MAX), warmed up front so the first test of each role
+    does not pay for the login and context creation.
+    """
+    roles = sorted({
+        role_of(item) for item in request.session.items if "page" in item.fixturenames
+    })
+    max_idle = int(os.environ.get("CONTEXT_POOL_MAX", "0")) or max(len(roles), 1)
+    pool = ContextPool(browser, storage_state_for=ui_auth_cache.get_or_login, max_idle=max_idle)
+
+    for role in roles:
+        try:
+            user = user_pool_manager.acquire(role, timeout=0)
+        except RuntimeError:
+            # Every user busy, or no users for the role: its tests will say so
+            continue
+        try:
+            pool.warm(user)
+        finally:
+            user_pool_manager.release(user)
+
+    yield pool
+    pool.close()
+
+
+@pytest.fixture
+def role(request):
+    return role_of(request.node)
+
+
+@pytest.fixture(scope="session")
+def user_pool_manager():
+    return UserPoolManager()
+
+
 @pytest.fixture
-def page(browser, auth_state):
-    context = browser.new_context(storage_state=None)
+def ui_user(role, user_pool_manager):
+    """
+    The user a UI test acts as, leased from its role's pool for the whole
+    test, so no two concurrent tests (on any worker) act as the same account.
+    """
+    user = user_pool_manager.acquire(role)
+    yield user
+    user_pool_manager.release(user)
+
+
+@pytest.fixture(scope="session")
+def asset_cache():
+    return AssetCache()
+
+
+@pytest.fixture
+def page(request, context_pool, ui_user, asset_cache):
+    har_marker = request.node.get_closest_marker("har")
+    if har_marker and not har_marker.args:
+        pytest.fail(
+            "@pytest.mark.har needs the HAR name, e.g. @pytest.mark.har('items_list')",
+            pytrace=False,
+        )
+
+    context = context_pool.lease(ui_user)
     page = context.new_page()
-    return page
+    perf.track_navigation(page)
+
+    # Routes run last-registered-first: blocking, then HAR, then asset cache
+    asset_cache.install(page)
+
+    if har_marker:
+        replay_backend_from_har(page, har_marker.args[0])
+
+    block_marker = request.node.get_closest_marker("block")
+    blocked = block_marker.args if block_marker else [
+        category for category in os.environ.get("BLOCK_REQUESTS", "").split(",") if category
+    ]
+    block_requests(page, blocked)
+
+    yield page
+
+    if har_marker and os.environ.get("HAR_UPDATE", "false").lower() == "true":
+        # The HAR is only written when its context closes
+        context_pool.discard(ui_user, context)
+    else:
+        context_pool.release(ui_user, context)
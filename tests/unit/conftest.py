@@ -0,0 +1,28 @@
+import pytest
+
+from api.api_client import APIClient
+from auth.api_login import api_login
+from stub.server import start_stub
+
+
+@pytest.fixture(autouse=True)
+def seed_guard():
+    # Framework unit tests need no backend and no seed data
+    yield
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    """
+    Fresh in-process stub backend / frontend, with BACKEND_BASE_URL etc. set.
+    """
+    servers = start_stub(latency_ms=0)
+    for name, value in servers.env().items():
+        monkeypatch.setenv(name, value)
+    yield servers
+    servers.stop()
+
+
+@pytest.fixture
+def api_client(stub):
+    return APIClient(token=api_login({"email": "admin@stub.local", "password": "stub"}))
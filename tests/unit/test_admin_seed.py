@@ -0,0 +1,78 @@
+import pytest
+
+from seed.admin_seed import AdminSeed
+from seed.backend_items import iter_items
+from seed.namespace import namespace_of
+from utils.seed_builders import FLOW3_ITEM_COUNT, iter_flow3_items
+
+
+@pytest.fixture(autouse=True)
+def manifest_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("SEED_MANIFEST_DIR", str(tmp_path))
+
+
+def baseline(api_client) -> list[dict]:
+    return [item for item in iter_items(api_client) if not namespace_of(item)]
+
+
+def count_requests(api_client, monkeypatch) -> list:
+    calls = []
+    real_request = api_client.request
+    monkeypatch.setattr(api_client, "request",
+                        lambda method, path, **kw: calls.append((method, path)) or
+                        real_request(method, path, **kw))
+    return calls
+
+
+def test_creates_the_baseline_once_then_verifies_with_one_query(api_client, monkeypatch):
+    AdminSeed(api_client).ensure()
+    assert len(baseline(api_client)) == FLOW3_ITEM_COUNT
+
+    calls = count_requests(api_client, monkeypatch)
+    AdminSeed(api_client).ensure()
+
+    assert calls == [("GET", "/items")]
+
+
+def test_unrelated_items_do_not_count_as_the_baseline(api_client):
+    for payload in iter_flow3_items(count=FLOW3_ITEM_COUNT, seed=0, namespace="run-1-abc-w0"):
+        api_client.post("/items", json=payload)
+    for index in range(FLOW3_ITEM_COUNT):
+        api_client.post("/items", json={"name": f"Other {index}", "tags": []})
+
+    AdminSeed(api_client).ensure()
+
+    assert len(baseline(api_client)) == FLOW3_ITEM_COUNT * 2
+    assert sum("seed" in item["tags"] for item in baseline(api_client)) == FLOW3_ITEM_COUNT
+
+
+def test_wiped_backend_is_reseeded_despite_the_manifest(api_client):
+    AdminSeed(api_client).ensure()
+    for item in iter_items(api_client):
+        api_client.delete(f"/items/{item['id']}")
+
+    AdminSeed(api_client).ensure()
+
+    assert len(baseline(api_client)) == FLOW3_ITEM_COUNT
+
+
+def test_content_change_replaces_stale_items(api_client, monkeypatch):
+    AdminSeed(api_client).ensure()
+    before = {item["id"]: item["price"] for item in baseline(api_client)}
+
+    monkeypatch.setenv("SEED_RNG_SEED", "7")
+    AdminSeed(api_client).ensure()
+    after = {item["id"]: item["price"] for item in baseline(api_client)}
+
+    expected = sorted(item["price"] for item in iter_flow3_items(seed=7))
+    assert sorted(after.values()) == expected
+    assert not before.keys() & after.keys()
+
+
+def test_manifest_is_not_recorded_when_the_backend_does_not_match(api_client, monkeypatch):
+    seed = AdminSeed(api_client)
+    monkeypatch.setattr(seed, "_create_seed", lambda missing_keys: None)
+
+    with pytest.raises(RuntimeError, match="still incomplete"):
+        seed.ensure()
+    assert seed.manifest.fingerprint() is None
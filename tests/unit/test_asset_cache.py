@@ -0,0 +1,122 @@
+import hashlib
+import time
+
+from ui.network import AssetCache
+
+URL = "http://frontend/static/app.js"
+
+
+class FakeResponse:
+    def __init__(self, status, headers, body=b""):
+        self.status = status
+        self.headers = headers
+        self._body = body
+
+    def body(self):
+        return self._body
+
+
+class FakeRequest:
+    method = "GET"
+    url = URL
+    headers = {}
+
+
+class FakeServer:
+    """
+    Serves one asset with the given Cache-Control (and an ETag if asked),
+    answering If-None-Match with 304 like the stub frontend does.
+    """
+
+    def __init__(self, cache_control="", etag=True):
+        self.headers = {"content-type": "application/javascript"}
+        if cache_control:
+            self.headers["cache-control"] = cache_control
+        self.etag = etag
+        self.body = b"v1"
+        self.requests = []
+
+    def respond(self, headers):
+        etag = f'"{hashlib.sha256(self.body).hexdigest()[:8]}"'
+        self.requests.append(headers.get("if-none-match"))
+        if self.etag and headers.get("if-none-match") == etag:
+            return FakeResponse(304, {"etag": etag})
+        return FakeResponse(200, {**self.headers, **({"etag": etag} if self.etag else {})}, self.body)
+
+
+class FakeRoute:
+    def __init__(self, server):
+        self.request = FakeRequest()
+        self._server = server
+        self.served = None
+
+    def fetch(self, headers=None):
+        return self._server.respond(headers or {})
+
+    def fulfill(self, response=None, status=None, headers=None, body=None):
+        self.served = response.body() if response else body
+
+    def fallback(self):
+        raise AssertionError("GET assets are always handled")
+
+
+def load(cache, server):
+    route = FakeRoute(server)
+    cache.handle(route)
+    return route.served
+
+
+def test_heuristic_entries_are_revalidated_once_per_process(tmp_path):
+    server = FakeServer()
+
+    load(AssetCache(cache_dir=str(tmp_path)), server)
+    cache = AssetCache(cache_dir=str(tmp_path))  # next process
+    assert [load(cache, server) for _ in range(3)] == [b"v1"] * 3
+
+    assert len(server.requests) == 2 and server.requests[1] is not None
+
+
+def test_no_cache_is_revalidated_on_every_use(tmp_path):
+    server = FakeServer(cache_control="no-cache")
+    cache = AssetCache(cache_dir=str(tmp_path))
+
+    load(cache, server)
+    assert load(cache, server) == b"v1"
+    server.body = b"v2"
+
+    assert load(cache, server) == b"v2"
+    assert len(server.requests) == 3
+
+
+def test_no_cache_without_etag_is_refetched(tmp_path):
+    server = FakeServer(cache_control="no-cache", etag=False)
+    cache = AssetCache(cache_dir=str(tmp_path))
+
+    load(cache, server)
+    server.body = b"v2"
+
+    assert load(cache, server) == b"v2"
+
+
+def test_max_age_bounds_freshness(tmp_path, monkeypatch):
+    server = FakeServer(cache_control="public, max-age=60", etag=False)
+    cache = AssetCache(cache_dir=str(tmp_path))
+    load(cache, server)
+    server.body = b"v2"
+
+    assert load(cache, server) == b"v1"
+    assert len(server.requests) == 1
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 61)
+    assert load(cache, server) == b"v2"
+
+
+def test_no_store_is_never_cached(tmp_path):
+    server = FakeServer(cache_control="no-store")
+    cache = AssetCache(cache_dir=str(tmp_path))
+
+    load(cache, server)
+    load(cache, server)
+
+    assert server.requests == [None, None]
@@ -0,0 +1,101 @@
+import base64
+import json
+import os
+import stat
+import threading
+import time
+
+import pytest
+
+from auth.auth_cache import AuthCache, expires_at
+
+
+def jwt(claims) -> str:
+    payload = base64.urlsafe_b64encode(json.dumps(claims).encode()).decode().rstrip("=")
+    return f"header.{payload}.signature"
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("AUTH_CACHE_DIR", str(tmp_path))
+    return tmp_path
+
+
+USER = {"email": "a@x", "password": "p"}
+
+
+def test_jwt_expiry_is_read_from_the_exp_claim():
+    assert expires_at(jwt({"exp": 1234})) == 1234
+    assert expires_at(jwt({"sub": "a"})) is None
+    assert expires_at("opaque-token") is None
+
+
+@pytest.mark.parametrize("value", ["a.MTIz.c", jwt([1, 2]), jwt("text"), "a.!!!.c"])
+def test_dotted_values_that_are_not_jwt_objects_have_no_expiry(value):
+    assert expires_at(value) is None
+
+
+def test_storage_state_expires_with_its_shortest_lived_credential():
+    state = {
+        "cookies": [
+            {"name": "long", "value": "x", "expires": 5000},
+            {"name": "session", "value": jwt({"exp": 4000}), "expires": -1},
+            {"name": "junk", "value": "a.MTIz.c", "expires": -1},
+        ],
+        "origins": [{"origin": "http://app", "localStorage": [
+            {"name": "token", "value": jwt({"exp": 3000})},
+            {"name": "store", "value": json.dumps({"auth": {"jwt": jwt({"exp": 2000})}})},
+            {"name": "theme", "value": "dark"},
+        ]}],
+    }
+    assert expires_at(state) == 2000
+    assert expires_at({"cookies": [{"name": "s", "value": "x", "expires": -1}]}) is None
+
+
+def test_concurrent_callers_trigger_one_login(cache_dir):
+    logins = []
+
+    def login(user):
+        logins.append(user["email"])
+        time.sleep(0.05)
+        return jwt({"exp": time.time() + 3600})
+
+    cache = AuthCache(login)
+    threads = [threading.Thread(target=cache.get_or_login, args=(USER,)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert logins == ["a@x"]
+    # A new process (fresh instance) reuses the file
+    assert AuthCache(login).get(USER) == cache.get(USER)
+
+
+def test_entries_are_refreshed_before_they_expire(monkeypatch):
+    monkeypatch.setenv("AUTH_REFRESH_MARGIN_SECONDS", "60")
+    tokens = iter([jwt({"exp": time.time() + 30}), jwt({"exp": time.time() + 3600})])
+    cache = AuthCache(lambda user: next(tokens))
+
+    first = cache.get_or_login(USER)
+    assert cache.get_or_login(USER) != first
+
+
+def test_entries_without_expiry_age_out(monkeypatch):
+    monkeypatch.setenv("AUTH_CACHE_MAX_AGE", "0.1")
+    tokens = iter(["opaque-1", "opaque-2"])
+    cache = AuthCache(lambda user: next(tokens))
+
+    assert cache.get_or_login(USER) == "opaque-1"
+    assert cache.get_or_login(USER) == "opaque-1"
+    time.sleep(0.15)
+    assert cache.get_or_login(USER) == "opaque-2"
+
+
+def test_cached_tokens_are_owner_only(cache_dir):
+    cache = AuthCache(lambda user: "opaque")
+    cache.get_or_login(USER)
+
+    [path] = [os.path.join(root, name) for root, _, names in os.walk(cache_dir)
+              for name in names if name.endswith(".json")]
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
@@ -0,0 +1,66 @@
+from ui.context_pool import ContextPool
+
+STATE = {"cookies": [], "origins": []}
+
+
+class FakeContext:
+    def __init__(self):
+        self.pages = []
+        self.closed = False
+
+    def unroute_all(self, behavior=None):
+        pass
+
+    def clear_permissions(self):
+        pass
+
+    def clear_cookies(self):
+        pass
+
+    def add_cookies(self, cookies):
+        pass
+
+    def storage_state(self):
+        return STATE
+
+    def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.contexts = []
+
+    def new_context(self, **options):
+        context = FakeContext()
+        self.contexts.append(context)
+        return context
+
+
+def user(n):
+    return {"email": f"user{n}@x", "role": "ADMIN"}
+
+
+def test_warmed_context_is_handed_to_the_first_lease():
+    browser = FakeBrowser()
+    pool = ContextPool(browser, storage_state_for=lambda u: STATE, max_idle=2)
+
+    pool.warm(user(1))
+    pool.warm(user(1))
+
+    assert pool.lease(user(1)) is browser.contexts[0]
+    assert len(browser.contexts) == 1
+
+
+def test_idle_contexts_are_capped_across_users():
+    browser = FakeBrowser()
+    pool = ContextPool(browser, storage_state_for=lambda u: STATE, max_idle=2)
+
+    leased = [(user(n), pool.lease(user(n))) for n in range(3)]
+    for owner, context in leased:
+        pool.release(owner, context)
+
+    # user0's context was the least recently released
+    assert [context.closed for _, context in leased] == [True, False, False]
+    assert pool.lease(user(2)) is leased[2][1]
+    assert pool.lease(user(0)) is browser.contexts[-1]
@@ -0,0 +1,108 @@
+import json
+import multiprocessing
+
+import pytest
+
+from config.users import lease_broker
+from config.users.lease_broker import LeaseBroker
+
+EMAILS = ["a@x", "b@x"]
+
+
+@pytest.fixture
+def broker(tmp_path, monkeypatch):
+    monkeypatch.setenv("USER_LEASE_POLL_SECONDS", "0.01")
+    return LeaseBroker(lease_dir=str(tmp_path), ttl=60)
+
+
+def lease_of(broker, email):
+    with open(broker._path("ADMIN")) as handle:
+        return json.load(handle)["leases"].get(email)
+
+
+def test_acquire_hands_out_each_user_once_in_pool_order(broker):
+    first, _ = broker.acquire("ADMIN", EMAILS, timeout=1)
+    second, _ = broker.acquire("ADMIN", EMAILS, timeout=1)
+
+    assert [first, second] == EMAILS
+    with pytest.raises(RuntimeError, match="No available users for role ADMIN"):
+        broker.acquire("ADMIN", EMAILS, timeout=0.1)
+
+
+def test_release_returns_user_to_the_pool(broker):
+    email, token = broker.acquire("ADMIN", ["a@x"], timeout=1)
+    broker.release("ADMIN", email, token, ["a@x"])
+
+    assert broker.acquire("ADMIN", ["a@x"], timeout=1)[0] == "a@x"
+
+
+def test_most_recently_released_user_is_handed_out_first(broker):
+    for _ in range(3):
+        email, token = broker.acquire("ADMIN", EMAILS, timeout=1)
+        broker.release("ADMIN", email, token, EMAILS)
+        assert email == "a@x"
+
+    first = broker.acquire("ADMIN", EMAILS, timeout=1)
+    second = broker.acquire("ADMIN", EMAILS, timeout=1)
+    broker.release("ADMIN", *second, EMAILS)
+    broker.release("ADMIN", *first, EMAILS)
+
+    assert broker.acquire("ADMIN", EMAILS, timeout=1)[0] == first[0]
+
+
+def test_stale_token_cannot_release_or_renew_a_reassigned_lease(tmp_path):
+    broker = LeaseBroker(lease_dir=str(tmp_path), ttl=0.05)
+    email, old_token = broker.acquire("ADMIN", ["a@x"], timeout=1)
+
+    # The lease expires and is handed to a new holder
+    new_email, new_token = broker.acquire("ADMIN", ["a@x"], timeout=3)
+    assert new_email == email and new_token != old_token
+
+    broker.release("ADMIN", email, old_token, ["a@x"])
+    broker.renew("ADMIN", email, old_token, ["a@x"])
+    assert lease_of(broker, email)["token"] == new_token
+
+    broker.release("ADMIN", email, new_token, ["a@x"])
+    assert lease_of(broker, email) is None
+
+
+def _acquire_and_exit(lease_dir):
+    LeaseBroker(lease_dir=lease_dir, ttl=60).acquire("ADMIN", ["a@x"], timeout=1)
+
+
+def test_lease_of_dead_process_is_reclaimed(tmp_path):
+    process = multiprocessing.get_context("fork").Process(
+        target=_acquire_and_exit, args=(str(tmp_path),)
+    )
+    process.start()
+    process.join()
+
+    broker = LeaseBroker(lease_dir=str(tmp_path), ttl=60)
+    assert broker.acquire("ADMIN", ["a@x"], timeout=1)[0] == "a@x"
+
+
+def test_pool_changes_are_picked_up(broker):
+    broker.acquire("ADMIN", ["a@x"], timeout=1)
+
+    assert broker.acquire("ADMIN", ["a@x", "c@x"], timeout=1)[0] == "c@x"
+
+
+def test_idle_polls_do_not_rewrite_state(broker, monkeypatch):
+    for _ in EMAILS:
+        broker.acquire("ADMIN", EMAILS, timeout=1)
+
+    writes = []
+    real_write = lease_broker.write_json_atomic
+    monkeypatch.setattr(lease_broker, "write_json_atomic",
+                        lambda *args: writes.append(args) or real_write(*args))
+    polls = []
+    real_try = broker._try_acquire
+    monkeypatch.setattr(broker, "_try_acquire",
+                        lambda *args: polls.append(args) or real_try(*args))
+
+    with pytest.raises(RuntimeError):
+        broker.acquire("ADMIN", EMAILS, timeout=0.3)
+
+    # Enqueue, one reclaim scan, dequeue on timeout; polls in between write nothing
+    assert len(polls) > 5
+    assert len(writes) <= 3
@@ -0,0 +1,43 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from utils import perf
+
+
+@pytest.fixture(autouse=True)
+def isolated_perf():
+    # Keep this run's own --perf-report data out of the way, and intact
+    was_enabled, kept = perf._enabled, perf.drain()
+    yield
+    perf.drain()
+    perf.enable(was_enabled)
+    perf._spans.extend(kept["spans"])
+    perf._counters.update(kept["counters"])
+
+
+def test_nothing_is_kept_while_reporting_is_off():
+    perf.enable(False)
+
+    with perf.span("outer"):
+        perf.count("api.requests")
+        perf.hit("auth_cache.api", True)
+
+    assert perf.drain() == {"spans": [], "counters": {}}
+
+
+def test_spans_nest_across_executor_threads():
+    perf.enable()
+
+    def inner():
+        with perf.span("inner"):
+            pass
+
+    with perf.span("outer"):
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            executor.submit(perf.bind(inner)).result()
+        perf.hit("auth_cache.api", False)
+
+    data = perf.drain()
+    assert [(s["name"], s["depth"]) for s in data["spans"]] == [("inner", 1), ("outer", 0)]
+    assert data["counters"] == {"auth_cache.api.miss": 1}
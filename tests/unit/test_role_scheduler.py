@@ -0,0 +1,122 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from plugins import role_scheduler
+from plugins.role_scheduler import RoleAffinityScheduling
+
+# scope -> (tests in the shard, weight)
+SHARDS = {
+    "ADMIN|flow3|0": (3, 10.0),
+    "EDITOR|flow3|0": (3, 6.0),
+    "EDITOR|flow3|1": (3, 5.0),
+    "ADMIN|other|0": (3, 1.0),
+}
+
+# nodeid -> scope, in collection order
+SCOPES = {
+    f"test_{scope.replace('|', '_')}.py::test_{index}": scope
+    for scope, (size, _) in SHARDS.items()
+    for index in range(size)
+}
+COLLECTION = list(SCOPES)
+
+
+class FakeNode:
+    def __init__(self, name):
+        self.gateway = SimpleNamespace(id=name)
+        self.shutting_down = False
+        self.sent = []
+
+    def send_runtest_some(self, indices):
+        self.sent.extend(indices)
+
+    def shutdown(self):
+        self.shutting_down = True
+
+
+@pytest.fixture
+def make_scheduler(tmp_path):
+    def make(workers: int, caps: dict):
+        affinity = {
+            "scopes": SCOPES,
+            "weights": {scope: weight for scope, (_, weight) in SHARDS.items()},
+            "caps": caps,
+        }
+        path = tmp_path / "affinity.json"
+        path.write_text(json.dumps(affinity))
+
+        config = SimpleNamespace(
+            getvalue=lambda name: [f"{workers}*popen"],
+            option=SimpleNamespace(loadscopereorder=True),
+        )
+        scheduler = RoleAffinityScheduling(config, None, str(path))
+        nodes = [FakeNode(f"gw{index}") for index in range(workers)]
+        for node in nodes:
+            scheduler.add_node(node)
+            scheduler.add_node_collection(node, COLLECTION)
+        scheduler.schedule()
+        return scheduler, nodes
+
+    return make
+
+
+def scopes_sent(node) -> set[str]:
+    return {SCOPES[COLLECTION[index]] for index in node.sent}
+
+
+def complete(scheduler, node, scope):
+    for index in list(node.sent):
+        nodeid = COLLECTION[index]
+        if SCOPES[nodeid] == scope and not scheduler.assigned_work[node][scope][nodeid]:
+            scheduler.mark_test_complete(node, index)
+
+
+def test_role_never_runs_on_more_workers_than_its_cap(make_scheduler):
+    scheduler, nodes = make_scheduler(workers=3, caps={"ADMIN": 1, "EDITOR": 1})
+
+    admin, editor, idle = nodes
+    assert scopes_sent(admin) == {"ADMIN|flow3|0"}
+    assert scopes_sent(editor) == {"EDITOR|flow3|0"}
+    assert idle.sent == []
+
+
+def test_idle_worker_is_rescheduled_when_a_role_slot_frees(make_scheduler):
+    scheduler, (gw0, gw1) = make_scheduler(workers=2, caps={"ADMIN": 1, "EDITOR": 2})
+    assert "ADMIN|other|0" in scheduler.workqueue
+
+    # gw0 prefetches the other editor shard; gw1 runs dry while ADMIN is capped
+    scheduler.mark_test_complete(gw0, gw0.sent[0])
+    assert "EDITOR|flow3|1" in scopes_sent(gw0)
+    complete(scheduler, gw1, "EDITOR|flow3|0")
+    assert "ADMIN|other|0" in scheduler.workqueue
+
+    # gw0 is still busy with EDITOR work, so the freed ADMIN slot goes to gw1
+    complete(scheduler, gw0, "ADMIN|flow3|0")
+    assert "ADMIN|other|0" in scopes_sent(gw1)
+    assert not scheduler.workqueue
+
+
+class NoCacheConfig:
+    """
+    Config as seen with `-p no:cacheprovider`: there is no `cache` attribute.
+    """
+
+    def __init__(self, role_affinity):
+        self._role_affinity = role_affinity
+
+    def getoption(self, name):
+        return self._role_affinity
+
+
+def test_missing_cache_provider_is_tolerated_without_role_affinity():
+    config = NoCacheConfig(role_affinity=False)
+
+    role_scheduler.pytest_configure(config)
+    role_scheduler.pytest_sessionfinish(SimpleNamespace(config=config))
+
+
+def test_role_affinity_requires_the_cache_provider():
+    with pytest.raises(pytest.UsageError, match="--role-affinity needs the cache provider"):
+        role_scheduler.pytest_configure(NoCacheConfig(role_affinity=True))
@@ -0,0 +1,53 @@
+import json
+
+from seed.seed_manifest import dataset_fingerprint
+from utils.seed_builders import (
+    ITEM_TYPES, SEED_BATCH_SIZE, build_flow3_items, iter_flow3_items, seed_key,
+)
+
+
+def dump(items) -> bytes:
+    return json.dumps(list(items), sort_keys=True).encode()
+
+
+def test_same_seed_gives_byte_identical_output():
+    assert dump(build_flow3_items(count=50, seed=7)) == dump(build_flow3_items(count=50, seed=7))
+    assert dump(build_flow3_items(count=50, seed=7)) != dump(build_flow3_items(count=50, seed=8))
+
+
+def test_start_regenerates_any_slice_on_its_own():
+    count = SEED_BATCH_SIZE * 2 + 10
+    full = list(iter_flow3_items(count=count, seed=3))
+
+    for start in (0, 5, SEED_BATCH_SIZE - 1, SEED_BATCH_SIZE, count - 1):
+        assert dump(iter_flow3_items(count=count, seed=3, start=start)) == dump(full[start:])
+
+
+def test_dataset_covers_every_item_type_with_unique_seed_keys():
+    items = build_flow3_items(seed=0)
+
+    assert {item["item_type"] for item in items} == set(ITEM_TYPES)
+    assert len({seed_key(item) for item in items}) == len(items)
+
+
+def test_seed_key_changes_with_item_content():
+    first, = iter_flow3_items(count=1, seed=1)
+    other, = iter_flow3_items(count=1, seed=2)
+
+    assert seed_key(first).rsplit("-", 1)[0] == seed_key(other).rsplit("-", 1)[0]
+    assert seed_key(first) != seed_key(other)
+
+
+def test_namespaced_items_are_a_dataset_of_their_own():
+    baseline = {seed_key(item) for item in build_flow3_items(seed=0)}
+    namespaced = {seed_key(item) for item in build_flow3_items(seed=0, namespace="run-1-abc-w0")}
+
+    assert not baseline & namespaced
+
+
+def test_fingerprint_tracks_content():
+    fingerprint, keys = dataset_fingerprint("ADMIN", build_flow3_items(seed=0))
+
+    assert dataset_fingerprint("ADMIN", build_flow3_items(seed=0)) == (fingerprint, keys)
+    assert dataset_fingerprint("ADMIN", build_flow3_items(seed=1))[0] != fingerprint
+    assert dataset_fingerprint("EDITOR", build_flow3_items(seed=0))[0] != fingerprint
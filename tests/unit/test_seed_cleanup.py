@@ -0,0 +1,79 @@
+import time
+
+from seed.backend_items import iter_items
+from seed.namespace import namespace_of, namespace_tag
+from seed.seed_cleanup import SeedCleaner
+from seed.seed_manager import SeedManager
+
+NAMESPACE = "run-1-abc-w0"
+
+
+def names_by_namespace(api_client) -> dict:
+    found = {}
+    for item in iter_items(api_client):
+        found.setdefault(namespace_of(item), []).append(item["name"])
+    return found
+
+
+def count_scans(api_client, monkeypatch) -> list:
+    calls = []
+    real_get = api_client.get
+    monkeypatch.setattr(api_client, "get",
+                        lambda path, **kw: calls.append(path) or real_get(path, **kw))
+    return calls
+
+
+def create(api_client, name, namespace=None) -> str:
+    tags = [namespace_tag(namespace)] if namespace else []
+    return api_client.post("/items", json={"name": name, "tags": tags}).json()["id"]
+
+
+def test_cleanup_deletes_tracked_ids_and_untracked_leftovers(api_client):
+    manager = SeedManager(api_client)
+    manager.seed_isolated(NAMESPACE, count=3)
+    manager.track(NAMESPACE, [create(api_client, "tracked", NAMESPACE)])
+    create(api_client, "written by a test", NAMESPACE)
+    create(api_client, "other worker", "run-1-abc-w1")
+    create(api_client, "baseline")
+
+    deleted = SeedCleaner(api_client).delete_namespace(
+        NAMESPACE, manager.namespace_item_ids(NAMESPACE)
+    )
+
+    assert deleted == 5
+    assert names_by_namespace(api_client) == {
+        "run-1-abc-w1": ["other worker"], None: ["baseline"],
+    }
+
+
+def test_fully_tracked_namespace_is_deleted_without_a_scan(api_client, monkeypatch):
+    manager = SeedManager(api_client)
+    manager.seed_isolated(NAMESPACE, count=3)
+    scans = count_scans(api_client, monkeypatch)
+
+    cleaner = SeedCleaner(api_client, scan_leftovers=False)
+    assert cleaner.delete_namespace(NAMESPACE, manager.namespace_item_ids(NAMESPACE)) == 3
+
+    assert scans == []
+    assert names_by_namespace(api_client) == {}
+
+
+def test_unknown_ids_fall_back_to_a_scan(api_client):
+    manager = SeedManager(api_client)
+    create(api_client, "untracked", NAMESPACE)
+    manager.track(NAMESPACE, None)
+
+    cleaner = SeedCleaner(api_client, scan_leftovers=False)
+
+    assert cleaner.delete_namespace(NAMESPACE, manager.namespace_item_ids(NAMESPACE)) == 1
+
+
+def test_sweep_deletes_old_namespaces_but_keeps_the_current_run(api_client):
+    now = int(time.time())
+    current = f"run-{now - 7200}-cur"
+    create(api_client, "crashed run", f"run-{now - 7200}-old-w0")
+    create(api_client, "this run", f"{current}-w1")
+    create(api_client, "fresh run", f"run-{now}-new-w0")
+
+    assert SeedCleaner(api_client).sweep_orphans(max_age=3600, current_run=current) == 1
+    assert sorted(names_by_namespace(api_client)) == [f"{current}-w1", f"run-{now}-new-w0"]
@@ -0,0 +1,62 @@
+import pytest
+
+from seed.backend_items import iter_items
+from seed.seed_engine import SeedEngine
+from utils.seed_builders import iter_flow3_items
+
+
+class FlakyClient:
+    """
+    Fails the first `failures` POSTs of every payload named in `flaky`.
+    """
+
+    def __init__(self, api_client, flaky: set[str], failures: int):
+        self.api_client = api_client
+        self.flaky = flaky
+        self.failures = failures
+        self.attempts = {}
+
+    def post(self, path, json):
+        names = [payload["name"] for payload in (json if isinstance(json, list) else [json])]
+        for name in names:
+            self.attempts[name] = self.attempts.get(name, 0) + 1
+        if any(name in self.flaky and self.attempts[name] <= self.failures for name in names):
+            raise ConnectionError("injected failure")
+        return self.api_client.post(path, json=json)
+
+
+def payloads(count=10):
+    return list(iter_flow3_items(count=count, seed=1))
+
+
+@pytest.mark.parametrize("bulk_path", [None, "/items/bulk"])
+def test_creates_every_item_and_reports_their_ids(api_client, bulk_path):
+    engine = SeedEngine(api_client, workers=4, bulk_path=bulk_path, bulk_size=3)
+    report = engine.run(iter(payloads()))
+
+    assert report.ok and report.created == 10 and report.all_ids_known
+    assert sorted(report.created_ids) == sorted(item["id"] for item in iter_items(api_client))
+
+
+def test_failed_items_are_retried_one_by_one(api_client):
+    flaky_name = payloads()[4]["name"]
+    client = FlakyClient(api_client, {flaky_name}, failures=2)
+
+    report = SeedEngine(client, workers=4, bulk_path="/items/bulk", bulk_size=5,
+                        max_retries=2).run(payloads())
+
+    assert report.ok and report.created == 10
+    assert client.attempts[flaky_name] == 3
+    assert len(list(iter_items(api_client))) == 10
+
+
+def test_items_still_failing_after_retries_are_reported(api_client):
+    flaky_name = payloads()[0]["name"]
+    client = FlakyClient(api_client, {flaky_name}, failures=5)
+
+    report = SeedEngine(client, workers=2, max_retries=1).run(payloads())
+
+    assert report.created == 9
+    assert [payload["name"] for payload, _ in report.failed] == [flaky_name]
+    with pytest.raises(RuntimeError, match="Seed failed for 1 item"):
+        report.raise_for_failures()
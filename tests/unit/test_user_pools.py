@@ -0,0 +1,104 @@
+import json
+import os
+
+import pytest
+
+from config.users import user_pools
+from config.users.lease_broker import LeaseBroker
+from config.users.user_pool_manager import UserPoolManager
+from config.users.user_pools import RolePool, worker_position
+
+
+@pytest.fixture(autouse=True)
+def no_user_env(tmp_path, monkeypatch):
+    for name in list(os.environ):
+        if name.startswith(("ADMIN_", "EDITOR_", "VIEWER_")):
+            monkeypatch.delenv(name)
+    monkeypatch.setenv("USER_ENV_FILE", str(tmp_path / "missing.env"))
+    monkeypatch.delenv("USER_CREDENTIALS_FILE", raising=False)
+    monkeypatch.delenv("PYTEST_XDIST_WORKER", raising=False)
+
+
+def set_users(monkeypatch, role, count):
+    for n in range(1, count + 1):
+        monkeypatch.setenv(f"{role}_{n}_EMAIL", f"{role.lower()}{n}@x")
+        monkeypatch.setenv(f"{role}_{n}_PASSWORD", "secret")
+
+
+def emails(users):
+    return [user.email for user in users]
+
+
+def test_users_merge_env_env_file_and_credentials_file(tmp_path, monkeypatch):
+    env_file = tmp_path / "users.env"
+    env_file.write_text(
+        "EDITOR_1_EMAIL=from-file@x\nEDITOR_1_PASSWORD=file\n"
+        "EDITOR_2_EMAIL=second@x\nEDITOR_2_PASSWORD=file\n"
+    )
+    credentials = tmp_path / "credentials.json"
+    credentials.write_text(json.dumps({"EDITOR": [
+        {"email": "second@x", "password": "dup"},
+        {"email": "third@x", "password": "json"},
+    ]}))
+    monkeypatch.setenv("USER_ENV_FILE", str(env_file))
+    monkeypatch.setenv("USER_CREDENTIALS_FILE", str(credentials))
+    monkeypatch.setenv("EDITOR_1_EMAIL", "from-env@x")
+    monkeypatch.setenv("EDITOR_1_PASSWORD", "env")
+
+    users = RolePool("EDITOR").users
+
+    assert emails(users) == ["from-env@x", "second@x", "third@x"]
+    assert users[0]["password"] == "env"
+    assert users[1].password == "file"  # first source wins for duplicates
+    assert users[2]["role"] == "EDITOR"
+
+
+def test_missing_role_only_fails_when_used():
+    pool = RolePool("VIEWER")
+
+    assert pool.size() == 0
+    with pytest.raises(RuntimeError, match="No users found for role VIEWER"):
+        pool.users
+
+
+def test_shards_are_disjoint_and_cover_the_pool(monkeypatch):
+    set_users(monkeypatch, "ADMIN", 5)
+    pool = RolePool("ADMIN")
+
+    shards = [emails(pool.shard(index, 2)) for index in range(2)]
+
+    assert shards == [["admin1@x", "admin3@x", "admin5@x"], ["admin2@x", "admin4@x"]]
+    with pytest.raises(RuntimeError, match="shard 5/6"):
+        pool.shard(5, 6)
+
+
+def test_worker_shard_follows_the_xdist_worker(monkeypatch):
+    set_users(monkeypatch, "ADMIN", 4)
+    assert worker_position() == (0, 1)
+
+    monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw1")
+    monkeypatch.setenv("PYTEST_XDIST_WORKER_COUNT", "2")
+
+    assert worker_position() == (1, 2)
+    assert emails(RolePool("ADMIN").worker_shard()) == ["admin2@x", "admin4@x"]
+
+
+def test_sharded_manager_leases_only_from_its_worker_slice(tmp_path, monkeypatch):
+    set_users(monkeypatch, "ADMIN", 4)
+    monkeypatch.setenv("USER_POOL_SHARDING", "true")
+    monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw1")
+    monkeypatch.setenv("PYTEST_XDIST_WORKER_COUNT", "2")
+    monkeypatch.setattr(user_pools, "_POOLS", {"ADMIN": RolePool("ADMIN")})
+
+    manager = UserPoolManager(broker=LeaseBroker(lease_dir=str(tmp_path), ttl=60))
+    leased = [manager.acquire("ADMIN", timeout=1) for _ in range(2)]
+
+    assert emails(leased) == ["admin2@x", "admin4@x"]
+    with pytest.raises(RuntimeError, match="No available users"):
+        manager.acquire("ADMIN", timeout=0)
+
+
+def test_role_pools_are_module_attributes():
+    assert user_pools.ADMIN_USERS is user_pools.get_pool("ADMIN")
+    with pytest.raises(AttributeError):
+        user_pools.AUDITOR_USERS
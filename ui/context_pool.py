@@ -0,0 +1,125 @@
+import os
+from collections import OrderedDict
+
+from utils import perf
+
+
+class ContextPool:
+    """
+    Per-worker pool of pre-authenticated BrowserContexts, keyed by user.
+
+    Contexts are created with the user's cached storage_state and reset on
+    release (pages, routes, permissions, cookies). A context whose storage
+    drifted from the baseline is closed instead of reused.
+
+    At most `max_idle` contexts are kept idle in total (default
+    CONTEXT_POOL_MAX); beyond that the least recently used user's context
+    is closed, so a worker that cycles through many users never holds
+    more than a handful of browser contexts.
+    """
+
+    def __init__(self, browser, storage_state_for, max_idle: int | None = None,
+                 context_options: dict | None = None):
+        self._browser = browser
+        self._storage_state_for = storage_state_for
+        self._max_idle = max_idle or int(os.environ.get("CONTEXT_POOL_MAX", "4"))
+        self._context_options = context_options or {}
+
+        self._idle = OrderedDict()  # email -> idle contexts, least recently used first
+        self._idle_count = 0
+        self._baseline = {}
+
+    def warm(self, user):
+        """
+        Log in (through the auth cache) and open one idle context for `user`
+        ahead of its first test.
+        """
+        key = self._refresh_baseline(user)
+        if not self._idle.get(key):
+            self._keep(key, self._new_context(user))
+
+    def lease(self, user):
+        key = self._refresh_baseline(user)
+        idle = self._idle.get(key)
+        perf.hit("context_pool", bool(idle))
+        if not idle:
+            return self._new_context(user)
+
+        context = idle.pop()
+        self._idle_count -= 1
+        if not idle:
+            del self._idle[key]
+        return context
+
+    def release(self, user, context):
+        key = user["email"]
+        if not self._reset(key, context):
+            self._close(context)
+            return
+        self._keep(key, context)
+
+    def discard(self, user, context):
+        """
+        Release without reuse, e.g. when the context must flush a recorded HAR.
+        """
+        self._close(context)
+
+    def close(self):
+        for contexts in self._idle.values():
+            for context in contexts:
+                self._close(context)
+        self._idle.clear()
+        self._idle_count = 0
+
+    def _keep(self, key: str, context):
+        self._idle.setdefault(key, []).append(context)
+        self._idle.move_to_end(key)
+        self._idle_count += 1
+
+        while self._idle_count > self._max_idle:
+            oldest_key, contexts = next(iter(self._idle.items()))
+            self._close(contexts.pop(0))
+            self._idle_count -= 1
+            if not contexts:
+                del self._idle[oldest_key]
+
+    def _new_context(self, user):
+        with perf.span("browser.new_context", role=user["role"]):
+            return self._browser.new_context(
+                storage_state=self._baseline[user["email"]],
+                **self._context_options,
+            )
+
+    def _refresh_baseline(self, user) -> str:
+        # AuthCache hands back the same object until it re-logs in
+        key = user["email"]
+        state = self._storage_state_for(user)
+        if self._baseline.get(key) is state:
+            return key
+
+        self._baseline[key] = state
+        for context in self._idle.pop(key, []):
+            self._close(context)
+            self._idle_count -= 1
+        return key
+
+    def _reset(self, key: str, context) -> bool:
+        baseline = self._baseline[key]
+        try:
+            for page in context.pages:
+                page.close()
+            context.unroute_all(behavior="ignoreErrors")
+            context.clear_permissions()
+            context.clear_cookies()
+            context.add_cookies(baseline.get("cookies", []))
+
+            # localStorage can only be restored through a page; cheaper to start over
+            return context.storage_state().get("origins", []) == baseline.get("origins", [])
+        except Exception:
+            return False
+
+    def _close(self, context):
+        try:
+            context.close()
+        except Exception:
+            pass
@@ -0,0 +1,209 @@
+import hashlib
+import json
+import os
+import re
+import time
+from urllib.parse import urlparse
+
+from utils.file_lock import write_bytes_atomic
+
+STATIC_ASSET_PATTERN = re.compile(
+    r"\.(js|mjs|css|woff2?|ttf|otf|eot|png|jpe?g|gif|svg|webp|avif|ico)(\?.*)?$"
+)
+DEFAULT_ANALYTICS_HOSTS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "segment.io",
+    "segment.com",
+    "hotjar.com",
+    "mixpanel.com",
+    "amplitude.com",
+    "clarity.ms",
+)
+BLOCK_CATEGORIES = {"analytics", "third_party", "images"}
+
+# Body is decoded by the time we see it, and its length may change
+_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+
+class AssetCache:
+    """
+    On-disk cache of static frontend assets, shared by all contexts and workers.
+
+    Entries are keyed by URL and follow the response's Cache-Control:
+    - max-age=N: served for N seconds, then revalidated or refetched
+    - no-cache:  revalidated (If-None-Match) or refetched on every use
+    - no-store:  never cached
+    Without a directive, entries with an ETag are revalidated once per
+    process and entries without one are served until ASSET_CACHE_MAX_AGE
+    seconds old.
+    """
+
+    def __init__(self, cache_dir: str | None = None, max_age: float | None = None):
+        self.cache_dir = cache_dir or os.environ.get("ASSET_CACHE_DIR", ".asset_cache")
+        self.max_age = max_age or float(os.environ.get("ASSET_CACHE_MAX_AGE", "86400"))
+        self._validated = set()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def install(self, page):
+        page.route(STATIC_ASSET_PATTERN, self.handle)
+
+    def handle(self, route):
+        request = route.request
+        if request.method != "GET":
+            route.fallback()
+            return
+
+        url = request.url
+        entry = self._read(url)
+
+        if entry is not None:
+            meta, body = entry
+            if self._is_fresh(url, meta):
+                self._fulfill(route, meta, body)
+                return
+
+            if meta.get("etag"):
+                response = route.fetch(headers={**request.headers, "if-none-match": meta["etag"]})
+                if response.status == 304:
+                    self._revalidated(url, meta, body)
+                    self._fulfill(route, meta, body)
+                    return
+                self._store(url, response)
+                route.fulfill(response=response)
+                return
+
+        response = route.fetch()
+        self._store(url, response)
+        route.fulfill(response=response)
+
+    def _is_fresh(self, url: str, meta: dict) -> bool:
+        if meta.get("no_cache"):
+            return False
+        if url in self._validated:
+            return True
+
+        max_age = meta.get("max_age")
+        if max_age is None:
+            max_age = 0 if meta.get("etag") else self.max_age
+        return time.time() - meta["stored_at"] < max_age
+
+    def _fulfill(self, route, meta: dict, body: bytes):
+        route.fulfill(status=meta["status"], headers=meta["headers"], body=body)
+
+    def _store(self, url: str, response):
+        directives = _cache_directives(response.headers.get("cache-control", ""))
+        if response.status != 200 or "no-store" in directives:
+            return
+
+        meta = {
+            "status": response.status,
+            "headers": {
+                name: value for name, value in response.headers.items()
+                if name.lower() not in _DROPPED_HEADERS
+            },
+            "etag": response.headers.get("etag"),
+            "max_age": _max_age(directives),
+            "no_cache": "no-cache" in directives,
+            "stored_at": time.time(),
+        }
+        self._write(url, meta, response.body())
+        if _heuristic(meta):
+            self._validated.add(url)
+
+    def _revalidated(self, url: str, meta: dict, body: bytes):
+        if _heuristic(meta):
+            self._validated.add(url)
+        elif meta.get("max_age"):
+            # Fresh for another max-age, for every worker
+            self._write(url, {**meta, "stored_at": time.time()}, body)
+
+    def _write(self, url: str, meta: dict, body: bytes):
+        # Meta and body in one file so a single rename publishes both
+        write_bytes_atomic(self._path(url), json.dumps(meta).encode() + b"\n" + body)
+
+    def _read(self, url: str) -> tuple[dict, bytes] | None:
+        try:
+            with open(self._path(url), "rb") as handle:
+                meta_line, body = handle.read().split(b"\n", 1)
+            return json.loads(meta_line), body
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _path(self, url: str) -> str:
+        return os.path.join(self.cache_dir, hashlib.sha256(url.encode()).hexdigest())
+
+
+def _cache_directives(cache_control: str) -> dict:
+    directives = {}
+    for part in cache_control.split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('"')
+    return directives
+
+
+def _heuristic(meta: dict) -> bool:
+    # No freshness directive from the server: the cache picks the lifetime
+    return meta.get("max_age") is None and not meta.get("no_cache")
+
+
+def _max_age(directives: dict) -> float | None:
+    try:
+        return float(directives["max-age"])
+    except (KeyError, ValueError):
+        return None
+
+
+def block_requests(page, categories):
+    """
+    Abort requests in the given categories: analytics, third_party, images.
+    Analytics hosts can be extended through ANALYTICS_HOSTS (comma-separated).
+    """
+    categories = set(categories)
+    unknown = categories - BLOCK_CATEGORIES
+    if unknown:
+        raise ValueError(f"Unknown request block categories: {sorted(unknown)}")
+    if not categories:
+        return
+
+    analytics_hosts = DEFAULT_ANALYTICS_HOSTS + tuple(
+        host.strip() for host in os.environ.get("ANALYTICS_HOSTS", "").split(",") if host.strip()
+    )
+    first_party = {
+        urlparse(os.environ[name]).hostname
+        for name in ("FRONTEND_BASE_URL", "BACKEND_BASE_URL")
+        if os.environ.get(name)
+    }
+
+    def handle(route):
+        request = route.request
+        host = urlparse(request.url).hostname or ""
+
+        if (
+            ("images" in categories and request.resource_type == "image")
+            or ("analytics" in categories and host.endswith(analytics_hosts))
+            or ("third_party" in categories and host not in first_party)
+        ):
+            route.abort("blockedbyclient")
+            return
+        route.fallback()
+
+    page.route("**/*", handle)
+
+
+def replay_backend_from_har(page, name: str):
+    """
+    Serve backend calls from HAR_DIR/<name>.har.
+    With HAR_UPDATE=true the HAR is (re)recorded from the real backend instead.
+    """
+    har_dir = os.environ.get("HAR_DIR", "hars")
+    update = os.environ.get("HAR_UPDATE", "false").lower() == "true"
+
+    page.route_from_har(
+        os.path.join(har_dir, f"{name}.har"),
+        url=f"{os.environ['BACKEND_BASE_URL']}/**",
+        update=update,
+        not_found="fallback" if update else "abort",
+    )
@@ -0,0 +1,38 @@
+import fcntl
+import os
+from contextlib import contextmanager
+
+
+@contextmanager
+def file_lock(path: str):
+    """
+    Exclusive advisory lock shared by threads, processes and xdist workers.
+    The lock file is created next to the data it protects.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    with open(path, "a+") as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def write_json_atomic(path: str, payload: str, mode: int = 0o644):
+    """
+    Write via a temp file + rename so readers never see a partial file.
+    `mode` applies from creation, so secrets are never briefly world-readable.
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+    with os.fdopen(fd, "w") as handle:
+        handle.write(payload)
+    os.replace(tmp_path, path)
+
+
+def write_bytes_atomic(path: str, payload: bytes):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as handle:
+        handle.write(payload)
+    os.replace(tmp_path, path)
@@ -0,0 +1,142 @@
+import contextvars
+import functools
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+# Recorded by this process once enabled; plugins/perf_report.py enables it
+# with --perf-report and collects them per worker. Off, everything is a no-op
+_enabled = False
+_spans = []
+_counters = Counter()
+_lock = threading.Lock()
+# Nesting depth of the current span; a ContextVar so asyncio.to_thread carries it
+_depth = contextvars.ContextVar("perf_depth", default=0)
+_current_test = None
+
+
+def enable(on: bool = True):
+    global _enabled
+    _enabled = on
+
+
+def set_current_test(nodeid: str | None):
+    global _current_test
+    _current_test = nodeid
+
+
+def record(name: str, start: float, duration: float, **attrs):
+    """
+    Record a finished span. `start` is a time.time() timestamp.
+    """
+    if not _enabled:
+        return
+
+    entry = {
+        "name": name,
+        "start": start,
+        "duration": duration,
+        "depth": _depth.get(),
+        "test": _current_test,
+        "pid": os.getpid(),
+        "tid": threading.get_ident(),
+    }
+    if attrs:
+        entry["attrs"] = attrs
+
+    with _lock:
+        _spans.append(entry)
+
+
+@contextmanager
+def span(name: str, **attrs):
+    if not _enabled:
+        yield
+        return
+
+    start_wall = time.time()
+    start = time.perf_counter()
+    token = _depth.set(_depth.get() + 1)
+    try:
+        yield
+    finally:
+        _depth.reset(token)
+        record(name, start_wall, time.perf_counter() - start, **attrs)
+
+
+def bind(func):
+    """
+    Make `func` record its spans as nested in the caller's current span when
+    it runs on an executor thread, so they are not counted as top-level
+    overhead on top of their parent.
+    """
+    depth = _depth.get()
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        token = _depth.set(depth)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _depth.reset(token)
+    return wrapper
+
+
+def timed(name: str):
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def count(name: str, amount: int = 1):
+    if not _enabled:
+        return
+    with _lock:
+        _counters[name] += amount
+
+
+def hit(cache: str, is_hit: bool):
+    count(f"{cache}.{'hit' if is_hit else 'miss'}")
+
+
+def track_navigation(page):
+    """
+    Record main-frame navigations of a Playwright page as `page.navigation`
+    spans (navigation request → DOMContentLoaded).
+    """
+    if not _enabled:
+        return
+
+    pending = {}
+
+    def on_request(request):
+        if request.is_navigation_request() and request.frame == page.main_frame:
+            pending["url"] = request.url
+            pending["start"] = time.time()
+            pending["clock"] = time.perf_counter()
+
+    def on_domcontentloaded(_):
+        if "clock" in pending:
+            record(
+                "page.navigation",
+                pending.pop("start"),
+                time.perf_counter() - pending.pop("clock"),
+                url=pending.pop("url"),
+            )
+
+    page.on("request", on_request)
+    page.on("domcontentloaded", on_domcontentloaded)
+
+
+def drain() -> dict:
+    with _lock:
+        data = {"spans": list(_spans), "counters": dict(_counters)}
+        _spans.clear()
+        _counters.clear()
+    return data
@@ -1,9 +1,54 @@
+import hashlib
+import json
 import random
-import uuid
-from datetime import datetime
+from datetime import datetime, timedelta
+from typing import Iterator
 
+FLOW3_ITEM_COUNT = 31  # Flow 3 requires 31+ items
+SEED_BATCH_SIZE = 1024  # part of the dataset identity: changing it changes the data
+SEED_EPOCH = datetime(2024, 1, 1)
 
-def build_flow3_items(created_by: str | None = None) -> list[dict]:
+ITEM_TYPES = ["PHYSICAL", "DIGITAL", "SERVICE"]
+CATEGORIES = ["Electronics", "Books", "Services", "Office"]
+SEED_KEY_PREFIX = "seedkey:"
+NAMESPACE_TAG_PREFIX = "ns:"
+
+
+def seed_key_tag(dataset: str, index: int, digest: str | None = None) -> str:
+    """
+    Stable per-item identity, carried in `tags` so it survives the round trip
+    through the backend and lets the seed layer diff what already exists.
+
+    With `digest` (see content_digest) the key also changes when the item's
+    content does, so stale items show up as missing keys.
+    """
+    tag = f"{SEED_KEY_PREFIX}{dataset}-{index:06d}"
+    return f"{tag}-{digest}" if digest else tag
+
+
+def namespace_tag(namespace: str) -> str:
+    """
+    Tag marking an item as belonging to a run/worker namespace, for cleanup.
+    """
+    return f"{NAMESPACE_TAG_PREFIX}{namespace}"
+
+
+def content_digest(payload: dict) -> str:
+    content = {key: value for key, value in payload.items() if key != "tags"}
+    return hashlib.sha256(json.dumps(content, sort_keys=True).encode()).hexdigest()[:12]
+
+
+def seed_key(payload: dict) -> str | None:
+    for tag in payload.get("tags") or []:
+        if tag.startswith(SEED_KEY_PREFIX):
+            return tag
+    return None
+
+
+def build_flow3_items(created_by: str | None = None,
+                      count: int = FLOW3_ITEM_COUNT,
+                      seed: int | None = None,
+                      namespace: str | None = None) -> list[dict]:
     """
     Build seed payloads for Flow 3.
 
@@ -17,53 +62,114 @@ def build_flow3_items(created_by: str | None = None) -> list[dict]:
         created_by: user id (optional)
                     - None → admin/global seed
                     - str  → editor-owned seed
+        count: number of items (defaults to the Flow 3 baseline)
+        seed: RNG seed (optional)
+              - None → fresh random dataset
+              - int  → byte-identical dataset on every run and worker
+        namespace: run/worker namespace (optional)
+                   - None → persistent data
+                   - str  → tagged "ns:<namespace>" for cleanup
 
     Returns:
         List of item payload dicts
     """
+    return list(iter_flow3_items(
+        created_by=created_by, count=count, seed=seed, namespace=namespace
+    ))
 
-    items = []
 
-    item_types = ["PHYSICAL", "DIGITAL", "SERVICE"]
-    categories = ["Electronics", "Books", "Services", "Office"]
+def iter_flow3_items(created_by: str | None = None,
+                     count: int = FLOW3_ITEM_COUNT,
+                     seed: int | None = None,
+                     start: int = 0,
+                     namespace: str | None = None) -> Iterator[dict]:
+    """
+    Lazily yield Flow 3 payloads, one at a time.
+    Use this for large datasets (10k+) so they never sit in memory at once.
 
-    for index in range(31):  # Flow 3 requires 31+ items
-        item_type = random.choice(item_types)
+    Columns are generated a batch at a time from an RNG derived from
+    (seed, batch index), so any slice can be regenerated on its own:
+    `start` skips ahead without generating the items before it.
+    """
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(64)
+
+    batch_index = start // SEED_BATCH_SIZE
+    skip = start - batch_index * SEED_BATCH_SIZE
+
+    while batch_index * SEED_BATCH_SIZE < count:
+        first = batch_index * SEED_BATCH_SIZE
+        size = min(SEED_BATCH_SIZE, count - first)
+        batch = _flow3_batch(created_by, seed, batch_index, first, size, namespace)
+
+        for item in batch[skip:]:
+            yield item
+        skip = 0
+        batch_index += 1
+
+
+def _flow3_batch(created_by: str | None, seed: int, batch_index: int,
+                 first: int, size: int, namespace: str | None) -> list[dict]:
+    # Every column is drawn for every row, whatever the item type, so the
+    # RNG stream never depends on branch outcomes.
+    rng = random.Random(f"flow3:{seed}:{batch_index}")
+    # Namespaced copies are a dataset of their own, never the shared baseline
+    dataset = f"flow3@{namespace}" if namespace else "flow3"
+
+    item_types = rng.choices(ITEM_TYPES, k=size)
+    categories = rng.choices(CATEGORIES, k=size)
+    name_suffixes = [rng.getrandbits(24) for _ in range(size)]
+    prices = [round(rng.uniform(10, 500), 2) for _ in range(size)]
+    weights = [round(rng.uniform(0.5, 10), 2) for _ in range(size)]
+    lengths = [round(rng.uniform(10, 100), 1) for _ in range(size)]
+    widths = [round(rng.uniform(10, 100), 1) for _ in range(size)]
+    heights = [round(rng.uniform(1, 50), 1) for _ in range(size)]
+    file_sizes = [rng.randint(1000, 5_000_000) for _ in range(size)]
+    durations = [rng.randint(1, 40) for _ in range(size)]
+    file_ids = [rng.getrandbits(128) for _ in range(size)]
+    document_sizes = [rng.randint(1000, 500_000) for _ in range(size)]
+
+    items = []
+
+    for row in range(size):
+        index = first + row
+        item_type = item_types[row]
+        created_at = (SEED_EPOCH + timedelta(minutes=index)).isoformat()
 
         base_item = {
-            "name": f"Item {index} {uuid.uuid4().hex[:6]}",
+            "name": f"Item {index} {name_suffixes[row]:06x}",
             "description": f"Description for item {index}",
             "item_type": item_type,
-            "price": round(random.uniform(10, 500), 2),
-            "category": random.choice(categories),
+            "price": prices[row],
+            "category": categories[row],
             "normalizedCategory": "general",
             "is_active": index % 2 == 0,
             "version": 1,
             "created_by": created_by,
             "tags": ["seed", "flow3"],
-            "createdAt": datetime.utcnow().isoformat(),
+            "createdAt": created_at,
         }
 
         # Conditional fields
         if item_type == "PHYSICAL":
             base_item.update({
-                "weight": round(random.uniform(0.5, 10), 2),
+                "weight": weights[row],
                 "dimensions": {
-                    "length": round(random.uniform(10, 100), 1),
-                    "width": round(random.uniform(10, 100), 1),
-                    "height": round(random.uniform(1, 50), 1),
+                    "length": lengths[row],
+                    "width": widths[row],
+                    "height": heights[row],
                 },
             })
 
         elif item_type == "DIGITAL":
             base_item.update({
                 "download_url": "https://example.com/download/file.zip",
-                "file_size": random.randint(1000, 5_000_000),
+                "file_size": file_sizes[row],
             })
 
         elif item_type == "SERVICE":
             base_item.update({
-                "duration_hours": random.randint(1, 40),
+                "duration_hours": durations[row],
             })
 
         # Optional fields (realistic but non-essential)
@@ -71,14 +177,18 @@ def build_flow3_items(created_by: str | None = None) -> list[dict]:
             base_item["embed_url"] = "https://example.com/embed/demo"
 
         if index % 4 == 0:
-            base_item["file_path"] = f"uploads/items/{uuid.uuid4().hex}.pdf"
+            base_item["file_path"] = f"uploads/items/{file_ids[row]:032x}.pdf"
             base_item["file_metadata"] = {
                 "original_name": "document.pdf",
                 "content_type": "application/pdf",
-                "size": random.randint(1000, 500_000),
-                "uploaded_at": datetime.utcnow().isoformat(),
+                "size": document_sizes[row],
+                "uploaded_at": created_at,
             }
 
+        base_item["tags"].append(seed_key_tag(dataset, index, content_digest(base_item)))
+        if namespace:
+            base_item["tags"].append(namespace_tag(namespace))
+
         items.append(base_item)
 
     return items